@@ -0,0 +1,247 @@
+# arb_tables.py
+"""
+Registro de tabelas de barra estabilizadora (ARB) por carro/kit.
+
+Cada tabela traz as curvas (posição, rigidez) dos eixos dianteiro e
+traseiro e, opcionalmente, o mapa de posições da asa (posição, variação do
+balanço aerodinâmico no eixo dianteiro em %). Além da tabela embutida
+(registrada pelo rigidez_backend), são lidas tabelas de arquivos em
+ARB_TABLE_DIRS:
+
+  - JSON:  {"front": [[1.0, 9.3], ...], "rear": [[1.0, 15.4], ...],
+            "wing": [["P14", -6.0], ...]}
+  - TOML:  front = [[1.0, 9.3], ...]  /  rear = [...]  /  wing = [["P14", -6.0], ...]
+  - CSV:   colunas axle,position,stiffness (axle = front, rear ou wing;
+           para wing, stiffness é o balanço aerodinâmico)
+
+O nome da tabela é o nome do arquivo sem extensão. A abertura do app só
+lista os diretórios; um arquivo é lido na primeira vez que sua tabela é
+pedida, e os arrays NumPy e índices derivados são montados no primeiro uso
+e mantidos na própria tabela, então trocar de carro depois é imediato.
+"""
+import csv
+import json
+import os
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+T = TypeVar('T')
+
+Tabela = List[Tuple[float, float]]
+TabelaAsa = List[Tuple[str, float]]
+
+AXLES = ('front', 'rear')
+TABLE_SUFFIXES = ('.json', '.toml', '.csv')
+
+# Diretórios lidos pelo registro padrão: tabelas distribuídas com o app e
+# tabelas do usuário, ao lado do banco de sessões
+ARB_TABLE_DIRS = (
+    Path(__file__).resolve().parent / 'assets' / 'arb_tables',
+    Path.home() / '.tire_pressure_app' / 'arb_tables',
+)
+
+
+def _validate(name: str, axle: str, rows: Iterable[Sequence[float]]) -> Tabela:
+    tabela = sorted((float(p), float(v)) for p, v in rows)
+    if len(tabela) < 2:
+        raise ValueError(f"Tabela {name}: eixo {axle} precisa de ao menos 2 posições.")
+    if len({p for p, _ in tabela}) != len(tabela):
+        raise ValueError(f"Tabela {name}: posições repetidas no eixo {axle}.")
+    return tabela
+
+
+def _validate_wing(name: str, rows: Iterable[Sequence]) -> TabelaAsa:
+    wing = [(str(p), float(v)) for p, v in rows]
+    if len({p for p, _ in wing}) != len(wing):
+        raise ValueError(f"Tabela {name}: posições de asa repetidas.")
+    return wing
+
+
+class ArbTable:
+    """
+    Curvas de rigidez de um carro/kit. As estruturas compiladas (arrays,
+    dicionários e os índices do rigidez_backend) são criadas no primeiro
+    acesso e reaproveitadas enquanto a tabela existir.
+
+    `wing` mantém a ordem informada (ex.: P14 ... P4); vazio se o carro não
+    tiver mapa de asa.
+    """
+
+    def __init__(self, name: str, front: Iterable[Sequence[float]],
+                 rear: Iterable[Sequence[float]], source: Optional[Path] = None,
+                 wing: Iterable[Sequence] = ()):
+        self.name = name
+        self.front = _validate(name, 'front', front)
+        self.rear = _validate(name, 'rear', rear)
+        self.wing = _validate_wing(name, wing)
+        self.source = source
+        self._cache: Dict[str, object] = {}
+        # reentrante: a construção de uma estrutura pode pedir outra da mesma tabela
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"ArbTable({self.name!r})"
+
+    def rows(self, axle: str) -> Tabela:
+        """Linhas (posição, rigidez) do eixo 'front' ou 'rear'."""
+        if axle not in AXLES:
+            raise ValueError(f"Eixo desconhecido: {axle}")
+        return self.front if axle == 'front' else self.rear
+
+    @cached_property
+    def front_dict(self) -> Dict[float, float]:
+        return dict(self.front)
+
+    @cached_property
+    def rear_dict(self) -> Dict[float, float]:
+        return dict(self.rear)
+
+    @cached_property
+    def arrays(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """{eixo: (posições crescentes, rigidez)} como arrays somente leitura."""
+        out = {}
+        for axle in AXLES:
+            pos, val = np.array(self.rows(axle), dtype=float).T
+            pos.flags.writeable = False
+            val.flags.writeable = False
+            out[axle] = (pos, val)
+        return out
+
+    def positions(self, axle: str) -> np.ndarray:
+        return self.arrays[axle][0]
+
+    def cached(self, key: str, builder: Callable[[], T]) -> T:
+        """Retorna a estrutura derivada `key`, construindo com builder() na primeira vez."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = builder()
+            return self._cache[key]
+
+
+def _load_json(path: Path) -> Dict[str, list]:
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _load_toml(path: Path) -> Dict[str, list]:
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ModuleNotFoundError:
+            raise ValueError("Tabelas TOML exigem Python 3.11+ ou o pacote tomli.") from None
+    with open(path, 'rb') as fh:
+        return tomllib.load(fh)
+
+
+def _load_csv(path: Path) -> Dict[str, list]:
+    data: Dict[str, list] = {axle: [] for axle in AXLES + ('wing',)}
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        for row in csv.DictReader(fh):
+            axle = row['axle'].strip().lower()
+            if axle not in data:
+                raise ValueError(f"{path.name}: eixo desconhecido '{row['axle']}'.")
+            data[axle].append((row['position'].strip(), row['stiffness']))
+    return data
+
+
+_LOADERS = {'.json': _load_json, '.toml': _load_toml, '.csv': _load_csv}
+
+
+def load_table(path: Union[str, Path], name: Optional[str] = None) -> ArbTable:
+    """
+    Lê uma tabela de um arquivo .json, .toml ou .csv.
+
+    Raises:
+        ValueError: extensão não suportada ou conteúdo inválido.
+    """
+    path = Path(path)
+    loader = _LOADERS.get(path.suffix.lower())
+    if loader is None:
+        raise ValueError(f"Formato de tabela não suportado: {path.suffix}")
+    data = loader(path)
+    try:
+        front, rear = data['front'], data['rear']
+    except KeyError as e:
+        raise ValueError(f"{path.name}: eixo {e.args[0]} ausente.") from None
+    return ArbTable(name or path.stem, front, rear, source=path, wing=data.get('wing', ()))
+
+
+class ArbTableRegistry:
+    """
+    Tabelas disponíveis por nome. Arquivos são descobertos na primeira
+    consulta e lidos apenas quando a tabela é pedida em get().
+    """
+
+    def __init__(self, dirs: Iterable[Union[str, Path]] = ()):
+        self.dirs = [Path(d) for d in dirs]
+        self._tables: Dict[str, ArbTable] = {}
+        self._files: Optional[Dict[str, Path]] = None
+        self._lock = threading.Lock()
+        self.default: Optional[str] = None
+
+    def _scan(self) -> Dict[str, Path]:
+        if self._files is None:
+            files: Dict[str, Path] = {}
+            for d in self.dirs:
+                if not d.is_dir():
+                    continue
+                for entry in sorted(os.scandir(d), key=lambda e: e.name):
+                    path = Path(entry.path)
+                    if entry.is_file() and path.suffix.lower() in TABLE_SUFFIXES:
+                        # diretórios posteriores (usuário) sobrepõem os anteriores
+                        files[path.stem] = path
+            self._files = files
+        return self._files
+
+    def register(self, table: ArbTable, default: bool = False) -> ArbTable:
+        """Registra uma tabela já montada (ex.: a tabela embutida)."""
+        with self._lock:
+            self._tables[table.name] = table
+            if default or self.default is None:
+                self.default = table.name
+        return table
+
+    def refresh(self) -> None:
+        """Relista os diretórios (tabelas de arquivo já lidas são descartadas)."""
+        with self._lock:
+            for name, path in (self._files or {}).items():
+                table = self._tables.get(name)
+                if table is not None and table.source == path:
+                    del self._tables[name]
+            self._files = None
+
+    def names(self) -> List[str]:
+        """Nomes disponíveis: tabelas registradas e arquivos encontrados."""
+        with self._lock:
+            files = self._scan()
+            return list(self._tables) + [n for n in files if n not in self._tables]
+
+    def get(self, name: Optional[str] = None) -> ArbTable:
+        """
+        Tabela `name` (ou a padrão), lendo o arquivo na primeira chamada.
+
+        Raises:
+            KeyError: nome desconhecido.
+        """
+        with self._lock:
+            name = name or self.default
+            table = self._tables.get(name)
+            if table is None:
+                path = self._scan().get(name)
+                if path is None:
+                    raise KeyError(f"Tabela de ARB desconhecida: {name}")
+                table = self._tables[name] = load_table(path, name)
+            return table
+
+
+# Registro padrão usado pelo backend e pela GUI
+registry = ArbTableRegistry(ARB_TABLE_DIRS)
@@ -1,20 +1,68 @@
+import math
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import Iterable, Iterator, List, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+import pressure_kernel
+import report_io
+from instrumentation import instrument
+from session_db import SessionDatabase
+from session_store import SessionStore
+
+TIRES = ['FL', 'FR', 'RL', 'RR']
+
+# Colunas de entrada usadas pelos cálculos
+INPUT_COLUMNS = ([f"{p}_{t}" for p in ('target', 'cold', 'hot') for t in TIRES] +
+                 ['air1', 'track1', 'air2', 'track2'])
+
+# Colunas calculadas agrupadas por pneu: FL, FR, RL, RR
+CALC_COLUMNS = [f"{c}_{t}" for t in TIRES for c in ('new_cold', 'corr_air', 'corr_track')]
+
+def _round2(value: float) -> float:
+    """
+    np.round(value, 2) sem NumPy: escala por 100, arredonda ao par mais
+    próximo (round e np.rint) e divide, nas mesmas operações de float.
+    """
+    scaled = value * 100
+    if not math.isfinite(scaled):
+        return scaled / 100
+    return round(scaled) / 100
+
+class _ExportState(NamedTuple):
+    """Estado do último CSV exportado para um caminho (usado no modo incremental)."""
+    rows: int
+    columns: List[str]
+    revision: int
+    size: int
 
 class TirePressureBackend:
     """
     Backend puro para cálculo de pressões e registro de sessões.
     O método calculate retorna apenas resultados calculados.
-    new_session armazena dados brutos + setup.
+    new_session armazena dados brutos + setup em um SessionStore colunar.
     export_report garante inclusão e ordenação dos campos calculados agrupados por pneu.
+    Os campos calculados ficam em cache por sessão e só são refeitos quando
+    os dados daquela sessão mudam.
+    Com db_path, as sessões também são persistidas em SQLite; o histórico só
+    é carregado para a memória quando algum método precisa dele.
     """
 
-    def __init__(self):
-        # armazena cada sessão como um dicionário de inputs brutos + setup
-        self._sessions: List[Dict[str, Union[str, float]]] = []
+    def __init__(self, db_path: Optional[str] = None):
+        # armazena as sessões (inputs brutos + setup) em colunas tipadas
+        self._sessions = SessionStore()
+        # persistência opcional; _row_ids mapeia linha do store -> id no banco
+        self._db = SessionDatabase(db_path) if db_path else None
+        self._row_ids: List[int] = []
+        self._loaded = self._db is None
+        # cache das colunas calculadas + revisão da sessão usada no cálculo
+        self._derived = np.empty((0, len(CALC_COLUMNS)))
+        self._derived_rev = np.empty(0, dtype=np.int64)
+        # último CSV exportado por caminho, para o modo incremental
+        self._export_state: Dict[Path, _ExportState] = {}
 
+    @instrument()
     def calculate(self, data: Dict[str, float]) -> Dict[str, float]:
         """
         data deve conter chaves de pressões e temperaturas:
@@ -22,34 +70,98 @@ class TirePressureBackend:
           - cold_FL, cold_FR, cold_RL, cold_RR
           - hot_FL, hot_FR, hot_RL, hot_RR
           - air1, track1, air2, track2
+        Chaves ausentes valem 0.0. Com hot_* igual a 0 (não medida), só o termo
+        da razão alvo/quente se anula: new_cold_* e corr_air_* valem 0, mas
+        corr_track_* ainda reflete a variação da pista e só é 0 se
+        track1 == track2. A fórmula é a de pressure_kernel.corrected_pressures,
+        em floats do Python (corrected_pressures_float), conferida contra as
+        expressões originais em tests/test_pressure_kernel.py.
         Retorna dict com:
           - new_cold_*, corr_air_*, corr_track_*
         """
-        # converte temperaturas para Kelvin
-        air1K   = data.get('air1', 0.0) + 273.15
-        air2K   = data.get('air2', 0.0) + 273.15
-        track1K = data.get('track1', 0.0) + 273.15
-        track2K = data.get('track2', 0.0) + 273.15
-
+        temps = (data.get('air1', 0.0), data.get('air2', 0.0),
+                 data.get('track1', 0.0), data.get('track2', 0.0))
         results: Dict[str, float] = {}
-        for t in ['FL', 'FR', 'RL', 'RR']:
-            tgt   = data.get(f"target_{t}", 0.0)
-            cold  = data.get(f"cold_{t}",   0.0)
-            hot   = data.get(f"hot_{t}",    1.0) or 1.0
-
-            new_cold   = cold * tgt / hot
-            corr_air   = new_cold * air2K / air1K if air1K else 0.0
-            new_cold_b = new_cold / 14.504
-            corr_track = (((new_cold_b + 1) * air2K) /
-                          ((air2K * (new_cold_b + 1) / (new_cold_b + 1)) +
-                           (track2K - track1K)) - 1) * 14.504 if track1K else 0.0
-
-            results[f"new_cold_{t}"]   = round(new_cold,   2)
-            results[f"corr_air_{t}"]   = round(corr_air,   2)
-            results[f"corr_track_{t}"] = round(corr_track, 2)
+        for t in TIRES:
+            new_cold, corr_air, corr_track = pressure_kernel.corrected_pressures_float(
+                data.get(f"target_{t}", 0.0), data.get(f"cold_{t}", 0.0),
+                data.get(f"hot_{t}", 0.0), *temps)
+            # arredonda como calculate_batch, para que os dois caminhos coincidam
+            results[f"new_cold_{t}"]   = _round2(new_cold)
+            results[f"corr_air_{t}"]   = _round2(corr_air)
+            results[f"corr_track_{t}"] = _round2(corr_track)
 
         return results
 
+    def calculate_batch(self,
+                        data: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> pd.DataFrame:
+        """
+        Versão vetorizada de calculate para muitas sessões de uma vez.
+        data pode ser um DataFrame ou um dict de arrays NumPy com as mesmas
+        chaves aceitas por calculate (colunas ausentes ou valores NaN valem 0.0).
+        Retorna DataFrame com uma linha por sessão e as colunas
+        new_cold_*, corr_air_*, corr_track_* agrupadas por pneu.
+        """
+        if isinstance(data, pd.DataFrame):
+            n = len(data)
+            index = data.index
+        else:
+            shapes = [np.shape(data[k]) for k in INPUT_COLUMNS if k in data]
+            n = (np.broadcast_shapes(*shapes) or (1,))[0] if shapes else 0
+            index = None
+
+        def col(key: str) -> np.ndarray:
+            if key not in data:
+                return np.zeros(n)
+            # valor ausente só em algumas sessões chega como NaN (DataFrame/SessionStore);
+            # vale 0.0, como a chave ausente em calculate
+            values = np.nan_to_num(np.asarray(data[key], dtype=float), nan=0.0)
+            return np.broadcast_to(values, (n,))
+
+        # pressões como matrizes (n, 4) e temperaturas como (n, 1): uma única
+        # chamada do kernel cobre os quatro pneus
+        def tires(prefix: str) -> np.ndarray:
+            return np.column_stack([col(f"{prefix}_{t}") for t in TIRES]) if n else np.zeros((0, 4))
+
+        def temp(key: str) -> np.ndarray:
+            return col(key)[:, None]
+
+        outputs = pressure_kernel.corrected_pressures(
+            tires('target'), tires('cold'), tires('hot'),
+            temp('air1'), temp('air2'), temp('track1'), temp('track2'))
+
+        # (n, 4, 3) -> (n, 12) na ordem de CALC_COLUMNS (agrupado por pneu)
+        values = np.round(np.stack(outputs, axis=2), 2).reshape(n, len(CALC_COLUMNS))
+        return pd.DataFrame(values, index=index, columns=CALC_COLUMNS)
+
+    def correction_grid(self, data: Dict[str, float],
+                        air2_range: Tuple[float, float] = pressure_kernel.AIR2_RANGE,
+                        track2_range: Tuple[float, float] = pressure_kernel.TRACK2_RANGE,
+                        step: float = pressure_kernel.GRID_STEP) -> pressure_kernel.CorrectionGrid:
+        """
+        Grade pré-calculada de corr_track dos quatro pneus sobre air2 × track2,
+        a partir das pressões e de air1/track1 em data (mesmas chaves de
+        calculate). grid.query(air2, track2) responde em tempo constante com
+        um valor por pneu, na ordem de TIRES. A grade fica em cache enquanto
+        as entradas não mudam.
+        """
+        return pressure_kernel.correction_grid(
+            [data.get(f"target_{t}", 0.0) for t in TIRES],
+            [data.get(f"cold_{t}", 0.0) for t in TIRES],
+            [data.get(f"hot_{t}", 0.0) for t in TIRES],
+            data.get('air1', 0.0), data.get('track1', 0.0),
+            air2_range, track2_range, step)
+
+    def _store(self) -> SessionStore:
+        """SessionStore com todo o histórico, carregado do banco na primeira chamada."""
+        if not self._loaded:
+            for session_id, rec in self._db.iter_sessions():
+                self._sessions.append(rec)
+                self._row_ids.append(session_id)
+            self._loaded = True
+        return self._sessions
+
+    @instrument()
     def new_session(self,
                     info: Dict[str, str],
                     pressures: Dict[str, float],
@@ -59,52 +171,194 @@ class TirePressureBackend:
         Registra uma nova sessão apenas com os dados brutos e setup,
         sem adicionar campos calculados.
         """
-        rec: Dict[str, Union[str, float]] = {}
-        rec.update(info)
-        rec.update(pressures)
-        rec.update(temps)
-        rec.update(setup)
-        rec['timestamp'] = datetime.now().isoformat()
-        self._sessions.append(rec)
+        self.new_sessions([(info, pressures, temps, setup)])
+
+    def new_sessions(self,
+                     sessions: Iterable[Tuple[Dict[str, str], Dict[str, float],
+                                              Dict[str, float], Dict[str, float]]]) -> None:
+        """
+        Registra várias sessões (info, pressures, temps, setup) de uma vez.
+        Com banco ativo, todas são gravadas em uma única transação.
+        """
+        recs: List[Dict[str, Union[str, float]]] = []
+        setup_fields = set()
+        for info, pressures, temps, setup in sessions:
+            rec: Dict[str, Union[str, float]] = {}
+            rec.update(info)
+            rec.update(pressures)
+            rec.update(temps)
+            rec.update(setup)
+            rec['timestamp'] = datetime.now()
+            recs.append(rec)
+            setup_fields.update(setup)
+        ids = self._db.insert_many(recs, indexed=setup_fields) if self._db else []
+        if self._loaded:
+            for rec in recs:
+                self._sessions.append(rec)
+            self._row_ids.extend(ids)
+
+    def update_session(self, index: int, fields: Dict[str, Union[str, float]]) -> None:
+        """
+        Altera campos de uma sessão já registrada (ex.: corrigir uma pressão).
+        Apenas o cache calculado dessa sessão é invalidado.
+        """
+        store = self._store()
+        store.update(index, fields)
+        if self._db:
+            self._db.update(self._row_ids[index], fields)
 
     def get_sessions(self) -> List[Dict[str, Union[str, float]]]:
         """Retorna todas as sessões armazenadas (inputs brutos + setup)."""
-        return list(self._sessions)
+        return list(self._store().records())
 
-    def export_report(self, path: str) -> None:
+    def get_sessions_page(self, after_id: int = 0,
+                          limit: int = 100) -> List[Tuple[int, Dict[str, Union[str, float]]]]:
         """
-        Exporta todas as sessões (inputs + setup + campos calculados) para Excel ou CSV.
-        Inclui e ordena colunas calculadas agrupadas por pneu (FL, FR, RL, RR).
+        Retorna até `limit` sessões como pares (id, sessão) com id > after_id.
+        Com banco ativo, lê direto do SQLite sem carregar o histórico; sem
+        banco, o id é a posição da sessão + 1.
+        """
+        if self._db and not self._loaded:
+            return self._db.fetch_page(after_id, limit)
+        store = self._sessions
+        if self._db:
+            start = int(np.searchsorted(self._row_ids, after_id, side='right'))
+            ids = self._row_ids
+        else:
+            start = max(after_id, 0)
+            ids = range(1, len(store) + 1)
+        stop = min(start + limit, len(store))
+        return [(ids[row], store.record(row)) for row in range(start, stop)]
+
+    def get_sessions_frame(self) -> pd.DataFrame:
+        """
+        Retorna as sessões como DataFrame colunar, sem copiar os dados
+        numéricos armazenados. Deve ser tratado como somente leitura.
+        """
+        return self._store().to_frame()
+
+    def _derived_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        # Prepara registros completos com cálculos
-        complete_records: List[Dict[str, Union[str, float]]] = []
-        for rec in self._sessions:
-            full = dict(rec)
-            calc_input = {k: v for k, v in full.items()
-                          if k.startswith(('target_', 'cold_', 'hot_', 'air', 'track'))}
-            full.update(self.calculate(calc_input))
-            complete_records.append(full)
+        Colunas calculadas de todas as sessões. Só as sessões cuja revisão
+        mudou desde o último cálculo passam por calculate_batch.
+        """
+        n = len(df)
+        if len(self._derived_rev) < n:
+            capacity = max(n, 2 * len(self._derived_rev))
+            derived = np.full((capacity, len(CALC_COLUMNS)), np.nan)
+            derived[:len(self._derived)] = self._derived
+            derived_rev = np.full(capacity, -1, dtype=np.int64)
+            derived_rev[:len(self._derived_rev)] = self._derived_rev
+            self._derived, self._derived_rev = derived, derived_rev
 
-        df = pd.DataFrame(complete_records)
+        revisions = self._sessions.revisions
+        stale = np.flatnonzero(self._derived_rev[:n] != revisions)
+        if stale.size:
+            self._derived[stale] = self.calculate_batch(df.iloc[stale]).to_numpy()
+            self._derived_rev[stale] = revisions[stale]
+        return pd.DataFrame(self._derived[:n], index=df.index, columns=CALC_COLUMNS)
 
-        # Ordena colunas calculadas por pneu: FL, FR, RL, RR
-        tire_order = ['FL', 'FR', 'RL', 'RR']
-        calc_cols = []
-        for t in tire_order:
-            calc_cols += [f"new_cold_{t}", f"corr_air_{t}", f"corr_track_{t}"]
+    @staticmethod
+    def _frame_chunks(base: pd.DataFrame, calc: pd.DataFrame,
+                      chunk_size: int = report_io.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Fatia base + colunas calculadas em blocos de até chunk_size linhas."""
+        for start in range(0, len(base), chunk_size):
+            stop = start + chunk_size
+            yield pd.concat([base.iloc[start:stop], calc.iloc[start:stop]], axis=1)
 
-        # Mantém colunas originais na ordem, depois adiciona calc_cols em sequência
-        original = [c for c in df.columns if c not in calc_cols]
-        df = df[original + calc_cols]
+    def iter_report_chunks(self,
+                           sessions: Optional[Iterable[Mapping[str, Union[str, float]]]] = None,
+                           chunk_size: int = report_io.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Gera o relatório (inputs + setup + campos calculados) em blocos de até
+        chunk_size sessões. Sem `sessions`, usa as sessões armazenadas; caso
+        contrário consome o iterável informado (ex.: um gerador lendo um
+        arquivo), mantendo só um bloco em memória.
+        """
+        if sessions is None:
+            df = self._store().to_frame()
+            calc = self._derived_columns(df)
+            base = df[[c for c in df.columns if c not in CALC_COLUMNS]]
+            yield from self._frame_chunks(base, calc, chunk_size)
+            return
+        for chunk in report_io.chunk_records(sessions, chunk_size):
+            base = chunk[[c for c in chunk.columns if c not in CALC_COLUMNS]]
+            yield pd.concat([base, self.calculate_batch(base)], axis=1)
+
+    def export_report_stream(self, path: str,
+                             sessions: Optional[Iterable[Mapping[str, Union[str, float]]]] = None,
+                             dialect: str = 'plain',
+                             chunk_size: int = report_io.CHUNK_SIZE,
+                             progress: Optional[report_io.Progress] = None) -> int:
+        """
+        Exporta o relatório para CSV em blocos, com memória de pico constante.
+        dialect: 'plain' (vírgula) ou 'locale' (ponto e vírgula, vírgula decimal).
+        progress recebe o número de sessões já gravadas após cada bloco.
+        Retorna o número de sessões gravadas.
+        """
+        return report_io.write_csv_chunks(self.iter_report_chunks(sessions, chunk_size), path,
+                                          dialect=dialect, progress=progress)
+
+    def _write_csv(self, out: Path, base: pd.DataFrame, calc: pd.DataFrame,
+                   incremental: bool) -> None:
+        """
+        Grava o CSV completo ou, no modo incremental, acrescenta apenas as
+        sessões novas desde a última exportação para o mesmo arquivo. Se alguma
+        sessão já exportada mudou, as colunas mudaram ou o arquivo foi alterado
+        por fora, o arquivo é reescrito por inteiro.
+        """
+        key = out.resolve()
+        columns = list(base.columns) + CALC_COLUMNS
+        state = self._export_state.get(key)
+        start = 0
+        if (incremental and state is not None and state.columns == columns
+                and out.exists() and out.stat().st_size == state.size
+                and not (self._sessions.revisions[:state.rows] > state.revision).any()):
+            start = state.rows
+
+        if start:
+            rows = pd.concat([base.iloc[start:], calc.iloc[start:]], axis=1)
+            rows.to_csv(out, index=False, mode='a', header=False)
+        else:
+            report_io.write_csv_chunks(self._frame_chunks(base, calc), out, columns=columns)
+        self._export_state[key] = _ExportState(len(base), columns,
+                                               self._sessions.revision, out.stat().st_size)
+
+    @instrument()
+    def export_report(self, path: str, incremental: bool = False) -> None:
+        """
+        Exporta todas as sessões (inputs + setup + campos calculados) para Excel, CSV
+        ou formato colunar (.feather/.arrow/.parquet, recarregável com
+        report_io.load_report).
+        Inclui e ordena colunas calculadas agrupadas por pneu (FL, FR, RL, RR).
+        Com incremental=True e destino CSV, acrescenta ao arquivo apenas as
+        sessões novas desde a última exportação (Excel é sempre reescrito).
+        """
+        df = self._store().to_frame()
+
+        # Colunas calculadas em cache; já vêm agrupadas por pneu (FL, FR, RL, RR)
+        calc = self._derived_columns(df)
+
+        # Mantém colunas originais na ordem, depois adiciona CALC_COLUMNS em sequência
+        original = [c for c in df.columns if c not in CALC_COLUMNS]
+        base = df[original]
 
         out = Path(path)
         if out.suffix.lower() in ['.xlsx', '.xls']:
+            df = pd.concat([base, calc], axis=1)
+            try:
+                # streaming (openpyxl write-only): memória constante no número de linhas
+                report_io.export_excel(df, out, sheet_name='Sheet1')
+            except ModuleNotFoundError:
+                df.to_csv(out.with_suffix('.csv'), index=False)
+        elif out.suffix.lower() in report_io.COLUMNAR_SUFFIXES:
+            df = pd.concat([base, calc], axis=1)
             try:
-                df.to_excel(out, index=False)
+                report_io.export_columnar(df, out)
             except ModuleNotFoundError:
                 df.to_csv(out.with_suffix('.csv'), index=False)
         else:
-            df.to_csv(out, index=False)
+            self._write_csv(out, base, calc, incremental)
 
 if __name__ == "__main__":
     # teste rápido
@@ -0,0 +1,405 @@
+# benchmarks.py
+"""
+Suíte de benchmarks do projeto, com geradores de dados sintéticos.
+
+Cobre o kernel de correção, o backend de pressões (calculate/export_report
+de 10² a 10⁵ sessões), as buscas de rigidez (find_setups/get_distribution,
+inclusive a busca de alta resolução) e os caminhos quentes da GUI (heatmap
+da aba ARB SETUP e update_chart com históricos grandes), além da abertura do
+app a frio, em um processo novo. A equivalência numérica dessas rotinas é
+conferida pelos testes em tests/ (python -m pytest).
+
+Os resultados são gravados em JSON para comparação entre versões.
+
+Uso:
+    python benchmarks.py                       # suíte completa
+    python benchmarks.py --quick               # tamanhos menores
+    python benchmarks.py --only kernel,rigidez # apenas algumas seções
+    python benchmarks.py --compare benchmark_results/anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import arb_tables
+import pressure_kernel
+import rigidez_backend
+from backend import INPUT_COLUMNS, TIRES, TirePressureBackend
+
+# Diretório padrão dos resultados gravados
+RESULTS_DIR = Path(__file__).resolve().parent / 'benchmark_results'
+
+# Seções disponíveis, na ordem de execução
+SECTIONS = ('kernel', 'backend', 'rigidez', 'gui', 'startup')
+
+
+def _random_inputs(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Sessões sintéticas com valores plausíveis de pista (e alguns hot == 0)."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for t in TIRES:
+        data[f"target_{t}"] = rng.uniform(20.0, 32.0, n).round(1)
+        data[f"cold_{t}"] = rng.uniform(18.0, 30.0, n).round(1)
+        hot = rng.uniform(24.0, 38.0, n).round(1)
+        hot[rng.random(n) < 0.02] = 0.0
+        data[f"hot_{t}"] = hot
+    for key in ('air1', 'air2'):
+        data[key] = rng.uniform(-5.0, 45.0, n).round(1)
+    for key in ('track1', 'track2'):
+        data[key] = rng.uniform(0.0, 65.0, n).round(1)
+    return data
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Menor tempo (s) entre `repeat` execuções de fn."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_kernel(sizes: List[int]) -> Dict[str, float]:
+    """Mede o kernel com um escalar e com arrays de vários tamanhos."""
+    results: Dict[str, float] = {}
+    args = (28.5, 25.0, 32.0, 30.0, 32.0, 35.0, 36.5)
+    calls = 2000
+    results['kernel_scalar_us'] = _best_of(
+        lambda: [pressure_kernel.corrected_pressures(*args) for _ in range(calls)]) / calls * 1e6
+    results['kernel_float_us'] = _best_of(
+        lambda: [pressure_kernel.corrected_pressures_float(*args) for _ in range(calls)]) / calls * 1e6
+    for n in sizes:
+        data = _random_inputs(n, seed=n)
+        tgt, cold, hot = (data[f"{p}_FL"] for p in ('target', 'cold', 'hot'))
+        temps = [data[k] for k in ('air1', 'air2', 'track1', 'track2')]
+        results[f'kernel_array_{n}_ms'] = _best_of(
+            lambda: pressure_kernel.corrected_pressures(tgt, cold, hot, *temps)) * 1e3
+    return results
+
+
+def bench_grid() -> Dict[str, float]:
+    """Mede a construção da grade air2 × track2 e a consulta interpolada."""
+    args = ([28.5] * 4, [25.0, 25.5, 24.8, 25.2], [32.0, 31.8, 32.1, 31.9], 30.0, 35.0)
+    calls = 2000
+    grid = pressure_kernel.CorrectionGrid(*args)
+    return {
+        'grid_build_ms': _best_of(lambda: pressure_kernel.CorrectionGrid(*args)) * 1e3,
+        'grid_query_us': _best_of(lambda: [grid.query(31.3, 40.2) for _ in range(calls)]) / calls * 1e6,
+    }
+
+
+def synthetic_sessions(n: int, seed: int = 0) -> Iterator[Tuple[Dict[str, str], Dict[str, float],
+                                                                Dict[str, float], Dict[str, float]]]:
+    """Gera n sessões (info, pressures, temps, setup) no formato de new_session."""
+    data = _random_inputs(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    arb = rng.choice(np.arange(1.0, 7.5, 0.5), size=(n, 4))
+    for i in range(n):
+        info = {'session_name': f"S{i % 500}", 'start_time': '10:00', 'end_time': '10:30'}
+        pressures = {k: float(data[k][i]) for k in INPUT_COLUMNS[:12]}
+        temps = {k: float(data[k][i]) for k in INPUT_COLUMNS[12:]}
+        setup = {'de': arb[i, 0], 'dd': arb[i, 1], 'te': arb[i, 2], 'td': arb[i, 3], 'asa': float(i % 11)}
+        yield info, pressures, temps, setup
+
+
+def synthetic_gui_sessions(n: int, seed: int = 0) -> List[Dict[str, object]]:
+    """Gera n registros no formato de TirePressureApp.sessions_data."""
+    phases = {'target': "Target Pressures (psi)", 'cold': "Cold Pressures (psi)",
+              'hot': "Hot Pressures (psi)"}
+    records = []
+    for info, pressures, temps, setup in synthetic_sessions(n, seed):
+        rec: Dict[str, object] = dict(info)
+        for key, value in pressures.items():
+            prefix, tire = key.split('_')
+            rec[f"{phases[prefix]}_{tire}"] = value
+        rec.update(temps)
+        for key, name in zip(('de', 'dd', 'te', 'td'), ('arb_fl', 'arb_fr', 'arb_rl', 'arb_rr')):
+            rec[name] = setup[key]
+        rec['wing'] = setup['asa']
+        rec['observacoes'] = ''
+        records.append(rec)
+    return records
+
+
+def bench_backend(sizes: List[int]) -> Dict[str, float]:
+    """
+    Mede calculate (sessão a sessão), calculate_batch e export_report, tanto
+    na primeira exportação (cache de colunas calculadas vazio) quanto nas
+    seguintes. Para .xlsx mede também o pico de memória (tracemalloc).
+    """
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'r.csv')
+        for n in sizes:
+            sessions = list(synthetic_sessions(n, seed=n))
+            first_export = float('inf')
+            for _ in range(3):
+                backend = TirePressureBackend()
+                backend.new_sessions(sessions)
+                start = time.perf_counter()
+                backend.export_report(csv_path)
+                first_export = min(first_export, time.perf_counter() - start)
+            records = backend.get_sessions()
+            frame = backend.get_sessions_frame()
+            results[f'backend_calculate_{n}_ms'] = _best_of(
+                lambda: [backend.calculate(rec) for rec in records], repeat=3) * 1e3
+            results[f'backend_calculate_batch_{n}_ms'] = _best_of(
+                lambda: backend.calculate_batch(frame)) * 1e3
+            results[f'backend_export_csv_first_{n}_ms'] = first_export * 1e3
+            results[f'backend_export_csv_cached_{n}_ms'] = _best_of(
+                lambda: backend.export_report(csv_path), repeat=3) * 1e3
+            if n <= 10**4:
+                xlsx_path = os.path.join(tmp, 'r.xlsx')
+                results[f'backend_export_xlsx_{n}_ms'] = _best_of(
+                    lambda: backend.export_report(xlsx_path), repeat=1) * 1e3
+                tracemalloc.start()
+                backend.export_report(xlsx_path)
+                results[f'backend_export_xlsx_{n}_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+    return results
+
+
+def bench_rigidez() -> Dict[str, float]:
+    """
+    Mede get_distribution (uma chamada), find_setups (simétrica, em lote e
+    por canto), a busca conjunta ARB × asa, o tensor de sensibilidade e a
+    busca de alta resolução (grade já em cache; mede só a consulta).
+    """
+    calls = 2000
+    setups = np.random.default_rng(0).uniform(1.0, 7.0, size=(10_000, 2))
+    return {
+        'rigidez_get_distribution_us': _best_of(
+            lambda: [rigidez_backend.get_distribution([3.0, 3.0], [5.5, 5.5])
+                     for _ in range(calls)]) / calls * 1e6,
+        'rigidez_find_setups_us': _best_of(
+            lambda: [rigidez_backend.find_setups(35.0, 2.0) for _ in range(100)]) / 100 * 1e6,
+        'rigidez_find_setups_topk_10_us': _best_of(
+            lambda: [rigidez_backend.find_setups_topk(40.0, 10.0, 10) for _ in range(100)]) / 100 * 1e6,
+        'rigidez_find_setups_batch_100_us': _best_of(
+            lambda: rigidez_backend.find_setups_batch(np.linspace(20.0, 50.0, 100), 0.5)) * 1e6,
+        'rigidez_axle_stiffness_pchip_10k_us': _best_of(
+            lambda: rigidez_backend.axle_stiffness(setups, 'front', 'pchip')) * 1e6,
+        'rigidez_find_balanced_setups_us': _best_of(
+            lambda: [rigidez_backend.find_balanced_setups(38.0, -1.0, baseline=(3.0, 5.0, 'P6'))
+                     for _ in range(20)]) / 20 * 1e6,
+        # tabela nova a cada chamada: mede a construção, não o cache
+        'rigidez_sensitivity_build_us': _best_of(
+            lambda: rigidez_backend.sensitivity(
+                arb_tables.ArbTable('bench', rigidez_backend._front, rigidez_backend._rear))) * 1e6,
+        # 1201 × 1201 ≈ 1,44·10⁶ combinações (passo 0,005)
+        'rigidez_highres_1e6_tol1_ms': _best_of(
+            lambda: rigidez_backend.find_setups_highres(35.0, 1.0, 100, step=0.005)) * 1e3,
+        'rigidez_highres_1e6_tol5_ms': _best_of(
+            lambda: rigidez_backend.find_setups_highres(35.0, 5.0, 100, step=0.005)) * 1e3,
+        'rigidez_find_setups_per_corner_us': _best_of(
+            lambda: [rigidez_backend.find_setups_per_corner(35.0, 2.0) for _ in range(20)]) / 20 * 1e6,
+    }
+
+
+def bench_gui(history_sizes: List[int]) -> Dict[str, float]:
+    """
+    Mede a construção do heatmap da aba ARB SETUP, update_chart com
+    históricos grandes (montagem completa) e o acréscimo de uma sessão
+    (atualização incremental e redesenho), a reabertura do gráfico em
+    tela cheia e o redimensionamento da janela (evento e troca de estilo). Usa a plataforma Qt offscreen se não houver display.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+    import tire_pressure_app
+
+    app = QApplication.instance() or QApplication([])
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # não toca no histórico real do usuário
+        tire_pressure_app.SESSION_DB_PATH = os.path.join(tmp, 'sessions.db')
+        win = tire_pressure_app.TirePressureApp(lazy_tabs=False)
+
+        def build_heatmap():
+            holder = QWidget()
+            win.add_heatmap_and_images(QVBoxLayout(holder))
+            holder.deleteLater()
+        results['gui_heatmap_ms'] = _best_of(build_heatmap, repeat=3) * 1e3
+
+        for n in history_sizes:
+            sessions = synthetic_gui_sessions(n + 5, seed=n)
+            extra = iter(sessions[n:])
+
+            def rebuild():
+                win.sessions_data = sessions[:n]
+                win.update_chart()
+            results[f'gui_update_chart_{n}_ms'] = _best_of(rebuild, repeat=3) * 1e3
+
+            def add_session():
+                # o que new_session faz com o gráfico, mais o redesenho agendado
+                win.sessions_data.append(next(extra))
+                win.update_chart()
+                win.canvas.draw()
+                win.mini_canvas.draw()
+            results[f'gui_add_session_{n}_ms'] = _best_of(add_session, repeat=5) * 1e3
+
+            def open_fullscreen():
+                # show_mini_fullscreen_chart sem o exec() modal; a 1ª chamada monta o diálogo
+                win._fullscreen_chart_dialog()
+                win._fullscreen_chart.ax.figure.canvas.draw()
+            results[f'gui_fullscreen_open_{n}_ms'] = _best_of(open_fullscreen, repeat=3) * 1e3
+
+        # Arraste da janela: só o custo por evento (o estilo espera o debounce)
+        win.show()
+        app.processEvents()
+        widths = range(1400, 1920, 20)
+
+        def drag():
+            for width in widths:
+                win.resize(width, 900)
+                app.processEvents()
+        results['gui_resize_event_ms'] = _best_of(drag, repeat=1) / len(widths) * 1e3
+
+        def restyle():
+            win._scale_bucket = None
+            win._apply_scale()
+        results['gui_restyle_ms'] = _best_of(restyle, repeat=3) * 1e3
+        win.close()
+        win.session_db.close()
+        app.processEvents()
+    return results
+
+
+# Executado em um processo novo por bench_startup; argv: modo (lazy/eager), banco
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+import tire_pressure_app
+imported = time.perf_counter()
+tire_pressure_app.SESSION_DB_PATH = sys.argv[2]
+app = QApplication([])
+win = tire_pressure_app.TirePressureApp(lazy_tabs=sys.argv[1] == 'lazy')
+win.show()
+app.processEvents()
+shown = time.perf_counter()
+win.tabs.setCurrentWidget(win.tab_rigidez_scroll)
+app.processEvents()
+arb = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1e3, 'window_ms': (shown - start) * 1e3,
+                  'arb_tab_ms': (arb - shown) * 1e3, 'pandas': 'pandas' in sys.modules}))
+"""
+
+
+def bench_startup(repeat: int = 3) -> Dict[str, float]:
+    """
+    Mede a abertura do app a frio (processo novo a cada repetição): import
+    de tire_pressure_app, janela exibida e a primeira ativação da aba ARB
+    SETUP, com a aba montada sob demanda (lazy) e na abertura (eager).
+    Avisa se o pandas foi carregado antes de qualquer exportação.
+    """
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('lazy', 'eager'):
+            runs = []
+            for _ in range(repeat):
+                out = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, mode,
+                                      os.path.join(tmp, 'sessions.db')],
+                                     capture_output=True, text=True, env=env, check=True,
+                                     cwd=Path(__file__).resolve().parent)
+                runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+            if mode == 'lazy' and any(run['pandas'] for run in runs):
+                print('aviso: pandas carregado na abertura do app')
+            for key in ('import_ms', 'window_ms', 'arb_tab_ms'):
+                results[f'startup_{mode}_{key}'] = min(run[key] for run in runs)
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, cwd=Path(__file__).resolve().parent, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: Dict[str, float], path: Path, label: str) -> None:
+    """Grava os resultados com metadados (versão, máquina, data) em JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'label': label,
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+
+
+def compare_results(results: Dict[str, float], baseline_path: Path) -> None:
+    """Imprime a razão atual/anterior de cada métrica presente nos dois arquivos."""
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    old = baseline['results']
+    print(f"\ncomparação com {baseline_path.name} ({baseline.get('git_revision') or '?'}):")
+    for name, value in results.items():
+        if name in old and old[name] > 0:
+            ratio = value / old[name]
+            flag = '  <-- mais lento' if ratio > 1.2 else ''
+            print(f'{name:<36} {old[name]:12.3f} -> {value:12.3f}  x{ratio:5.2f}{flag}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='tamanhos menores')
+    parser.add_argument('--only', default=','.join(SECTIONS),
+                        help=f"seções separadas por vírgula ({', '.join(SECTIONS)})")
+    parser.add_argument('--label', default=None, help='nome desta execução (padrão: revisão git)')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='arquivo JSON de saída (padrão: benchmark_results/<label>.json)')
+    parser.add_argument('--compare', type=Path, default=None,
+                        help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    sections = [s.strip() for s in args.only.split(',') if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"seções desconhecidas: {', '.join(sorted(unknown))}")
+
+    results: Dict[str, float] = {}
+    if 'kernel' in sections:
+        results.update(bench_kernel([10**3, 10**4] if args.quick else [10**3, 10**4, 10**5, 10**6]))
+        results.update(bench_grid())
+    if 'backend' in sections:
+        results.update(bench_backend([10**2, 10**3] if args.quick else [10**2, 10**3, 10**4, 10**5]))
+    if 'rigidez' in sections:
+        results.update(bench_rigidez())
+    if 'gui' in sections:
+        results.update(bench_gui([10, 100] if args.quick else [10, 100, 1000, 5000]))
+    if 'startup' in sections:
+        results.update(bench_startup(1 if args.quick else 3))
+
+    for name, value in results.items():
+        print(f'{name:<36} {value:12.3f}')
+
+    label = args.label or _git_revision() or datetime.now().strftime('%Y%m%d-%H%M%S')
+    output = args.output or RESULTS_DIR / f'{label}.json'
+    save_results(results, output, label)
+    print(f'\nresultados gravados em {output}')
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+# chart_model.py
+"""
+Séries do gráfico de sessões da GUI e desenho incremental.
+
+SessionSeries guarda os valores de cada série (pressões por fase/pneu e
+temperaturas) em arrays NumPy que crescem por duplicação de capacidade,
+como o SessionStore do backend. IncrementalChart desenha essas séries em
+um Axes mantendo os mesmos objetos Line2D: uma sessão nova só troca os
+dados das linhas (set_data) e agenda o redesenho com draw_idle. Eixos,
+legenda e cursor só são recriados quando o conjunto de séries muda.
+"""
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+PHASES = ("Target Pressures (psi)", "Cold Pressures (psi)", "Hot Pressures (psi)")
+TIRES = ('FL', 'FR', 'RL', 'RR')
+TEMPERATURES = ('air1', 'air2', 'track1', 'track2')
+
+# Séries na ordem das linhas (e da legenda) do gráfico
+SERIES_KEYS = tuple(f"{ph}_{t}" for ph in PHASES for t in TIRES) + TEMPERATURES
+
+# Máximo de rótulos de sessão no eixo x; acima disso os rótulos são espaçados
+MAX_XTICKS = 20
+
+# Acima de um ponto por pixel da largura do Axes, cada linha é reduzida ao
+# envelope (mínimo e máximo) de faixas de 2 pixels; o desenho fica igual e o
+# custo do Agg deixa de crescer com o número de sessões
+MIN_ENVELOPE_BUCKETS = 100
+
+# Espera após o último evento de redimensionamento do canvas antes de refazer
+# margens (tight_layout) e a redução das linhas
+RELAYOUT_DELAY_MS = 120
+
+
+def _as_float(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def envelope_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Índices (crescentes) do mínimo e do máximo de `y` em cada uma de
+    `buckets` faixas contíguas, mais o primeiro e o último ponto. NaN é
+    ignorado, a não ser em faixas só com NaN.
+    """
+    n = len(y)
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    nan = np.isnan(padded)
+    base = np.arange(rows)[:, None] * size
+    lo = np.where(nan, np.inf, padded).argmin(axis=1)[:, None] + base
+    hi = np.where(nan, -np.inf, padded).argmax(axis=1)[:, None] + base
+    idx = np.unique(np.concatenate([lo.ravel(), hi.ravel(), [0, n - 1]]))
+    return idx[idx < n]
+
+
+class SessionSeries:
+    """
+    Valores das séries do gráfico, uma posição por sessão (NaN quando a
+    sessão não tem o campo). `sync` acompanha a lista de sessões da GUI:
+    se a lista só cresceu, copia apenas as sessões novas.
+
+    `revision` muda a cada alteração dos dados; `structure` muda quando o
+    conjunto de séries presentes muda ou a lista é trocada, indicando que
+    os gráficos precisam ser montados de novo.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+        self._values = {key: np.full(self._capacity, np.nan) for key in SERIES_KEYS}
+        self._x = np.arange(self._capacity, dtype=float)
+        self._source: Optional[Sequence[Mapping[str, object]]] = None
+        self.names: List[str] = []
+        self.present: List[str] = []
+        self.revision = 0
+        self.structure = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def x(self) -> np.ndarray:
+        """Posições das sessões no eixo x (0 .. n-1)."""
+        return self._x[:self._size]
+
+    def values(self, key: str) -> np.ndarray:
+        """Valores da série `key` (view, sem cópia)."""
+        return self._values[key][:self._size]
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._capacity:
+            return
+        capacity = max(size, self._capacity * 2)
+        for key, arr in self._values.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = arr[:self._size]
+            self._values[key] = grown
+        self._x = np.arange(capacity, dtype=float)
+        self._capacity = capacity
+
+    def reset(self, records: Sequence[Mapping[str, object]]) -> None:
+        """Descarta as séries e as recria a partir de `records`."""
+        self._size = 0
+        self.names = []
+        self.present = []
+        self._source = records
+        self.structure += 1
+        self.extend(records)
+        self.revision += 1
+
+    def extend(self, records: Sequence[Mapping[str, object]]) -> None:
+        """Acrescenta sessões ao final das séries."""
+        if not records:
+            return
+        start = self._size
+        self._reserve(start + len(records))
+        stop = start + len(records)
+        for key in SERIES_KEYS:
+            self._values[key][start:stop] = [_as_float(rec.get(key)) for rec in records]
+            if key not in self.present and any(key in rec for rec in records):
+                self.present = [k for k in SERIES_KEYS if k in self.present or k == key]
+                self.structure += 1
+        self.names.extend(str(rec.get('session_name', '')) for rec in records)
+        self._size += len(records)
+        self.revision += 1
+
+    def sync(self, records: Sequence[Mapping[str, object]]) -> bool:
+        """
+        Atualiza as séries para a lista `records`. Retorna True se algo mudou.
+        Uma lista diferente (ou menor) da última sincronizada é relida inteira.
+        """
+        if records is not self._source or len(records) < self._size:
+            self.reset(records)
+            return True
+        if len(records) == self._size:
+            return False
+        self.extend(records[self._size:])
+        return True
+
+
+class IncrementalChart:
+    """
+    Desenha um SessionSeries em `ax`, reaproveitando as linhas entre
+    atualizações. Os rótulos do eixo x são limitados a MAX_XTICKS e, com
+    mais sessões que pixels, as linhas recebem só o envelope dos pontos
+    (envelope_indices), então nem refresh nem o redesenho agendado com
+    draw_idle crescem com o histórico.
+    """
+
+    def __init__(self, ax, model: SessionSeries, linewidth: Optional[float] = None,
+                 legend_fontsize='small', label_fontsize: Optional[float] = None,
+                 empty_fontsize: Optional[float] = None, layout_pad: float = 1.08):
+        self.ax = ax
+        self.model = model
+        self.linewidth = linewidth
+        self.legend_fontsize = legend_fontsize
+        self.label_fontsize = label_fontsize
+        self.empty_fontsize = empty_fontsize
+        self.layout_pad = layout_pad
+        self.lines: Dict[str, object] = {}
+        self.cursor = None
+        self._structure: Optional[int] = None
+        self._revision: Optional[int] = None
+        self._ticks: Optional[List[int]] = None
+        # Margens e redução das linhas refeitas só quando o redimensionamento para
+        self._resize_timer = ax.figure.canvas.new_timer(interval=RELAYOUT_DELAY_MS)
+        self._resize_timer.single_shot = True
+        self._resize_timer.add_callback(self._on_resize)
+        ax.figure.canvas.mpl_connect('resize_event', self._restart_resize_timer)
+
+    def _line_data(self, key: str):
+        x, y = self.model.x, self.model.values(key)
+        buckets = max(int(self.ax.bbox.width) // 2, MIN_ENVELOPE_BUCKETS)
+        if len(y) <= 2 * buckets:
+            return x, y
+        idx = envelope_indices(y, buckets)
+        return x[idx], y[idx]
+
+    def _set_line_data(self) -> None:
+        for key, line in self.lines.items():
+            line.set_data(*self._line_data(key))
+
+    def _restart_resize_timer(self, event) -> None:
+        self._resize_timer.stop()
+        self._resize_timer.start()
+
+    def _on_resize(self) -> None:
+        # A redução das linhas e as margens dependem do tamanho em pixels
+        if self.lines:
+            self._set_line_data()
+            self.ax.figure.tight_layout(pad=self.layout_pad)
+            self.ax.figure.canvas.draw_idle()
+
+    def _rebuild(self) -> None:
+        """Monta o gráfico do zero (séries novas ou lista de sessões trocada)."""
+        import mplcursors
+
+        ax, model = self.ax, self.model
+        ax.clear()
+        self.lines = {}
+        self._ticks = None
+        if not len(model):
+            ax.text(0.5, 0.5, 'No data', ha='center', va='center', fontsize=self.empty_fontsize)
+            self.cursor = None
+            return
+        kwargs = {} if self.linewidth is None else {'linewidth': self.linewidth}
+        for key in model.present:
+            self.lines[key], = ax.plot(*self._line_data(key), label=key, **kwargs)
+        ax.set_xlabel('Session Name', fontsize=self.label_fontsize)
+        ax.set_ylabel('Value', fontsize=self.label_fontsize)
+        # Legenda abaixo do gráfico em múltiplas linhas
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=4,
+                  fontsize=self.legend_fontsize)
+        ax.grid(True, linestyle='--', alpha=0.7)
+
+        # Interatividade; o nome da sessão é lido do modelo no momento do hover
+        self.cursor = mplcursors.cursor(list(self.lines.values()), hover=True)
+
+        @self.cursor.connect("add")
+        def on_add(sel):
+            x_val = int(round(sel.target[0]))
+            y_val = sel.target[1]
+            session_name = model.names[x_val] if 0 <= x_val < len(model.names) else ''
+            sel.annotation.set_text(f'Session: {session_name}\nValue: {y_val:.2f}')
+            sel.annotation.get_bbox_patch().set(fc="black", alpha=0.8)
+            sel.annotation.set_color('white')
+
+    def _update_ticks(self) -> bool:
+        n = len(self.model)
+        step = -(-n // MAX_XTICKS)
+        ticks = list(range(0, n, step))
+        if ticks == self._ticks:
+            return False
+        self.ax.set_xticks(ticks, [self.model.names[i] for i in ticks], rotation=45, ha='right')
+        self._ticks = ticks
+        return True
+
+    def refresh(self, force: bool = False) -> None:
+        """Sincroniza o gráfico com o modelo e agenda o redesenho."""
+        model = self.model
+        if not force and model.revision == self._revision:
+            return
+        rebuilt = force or model.structure != self._structure
+        if rebuilt:
+            self._rebuild()
+        else:
+            self._set_line_data()
+            self.ax.relim()
+            self.ax.autoscale_view()
+        if len(model) and self._update_ticks():
+            # rótulos novos podem mudar as margens necessárias
+            self.ax.figure.tight_layout(pad=self.layout_pad)
+        self._structure = model.structure
+        self._revision = model.revision
+        self.ax.figure.canvas.draw_idle()
@@ -0,0 +1,159 @@
+# export_worker.py
+"""
+Exportação de relatórios da GUI fora da thread principal (QThreadPool),
+com progresso, cancelamento e aviso de conclusão por sinais Qt.
+"""
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+import report_io
+from session_db import SessionDatabase
+
+
+class ExportSignals(QObject):
+    """Sinais do worker; conectados na thread da GUI (entrega enfileirada)."""
+    progress = Signal(int, int)   # linhas gravadas, total
+    finished = Signal(str, str)   # caminho gravado, aviso de fallback ('' se não houve)
+    failed = Signal(str)          # mensagem de erro
+    cancelled = Signal()
+
+
+class ReportExportWorker(QRunnable):
+    """
+    Exporta as sessões para .xlsx, formato colunar ou CSV (ponto e vírgula,
+    vírgula decimal), conforme a extensão de `path`. Se o formato escolhido
+    falhar, grava um CSV ao lado, como a exportação síncrona fazia.
+
+    Cada arquivo é gravado em um temporário na mesma pasta e só substitui o
+    destino quando termina; cancelar apaga apenas o temporário, e um
+    arquivo que já existia no destino fica intacto.
+
+    As sessões vêm de `rows`, copiadas na criação, ou, com from_database,
+    do histórico SQLite lido em páginas na própria thread do worker. Nos
+    dois casos a GUI pode continuar registrando sessões durante a exportação.
+    """
+
+    def __init__(self, rows: Sequence[Mapping[str, object]], columns: Sequence[str],
+                 path: str, chunk_size: int = report_io.CHUNK_SIZE):
+        super().__init__()
+        self.rows: List[Mapping[str, object]] = list(rows)
+        self.columns = list(columns)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total = len(self.rows)
+        self.signals = ExportSignals()
+        self._cancel = threading.Event()
+        self._db_path: Optional[str] = None
+        self._db: Optional[SessionDatabase] = None
+
+    @classmethod
+    def from_database(cls, db_path: Union[str, Path], columns: Sequence[str], path: str,
+                      chunk_size: int = report_io.CHUNK_SIZE) -> 'ReportExportWorker':
+        """
+        Worker que exporta todas as sessões do banco em `db_path`. Das
+        colunas `columns`, ficam as que têm valor em alguma sessão.
+        """
+        worker = cls([], columns, path, chunk_size)
+        worker._db_path = str(db_path)
+        return worker
+
+    def cancel(self) -> None:
+        """Pede o cancelamento; vale a partir do próximo bloco gravado."""
+        self._cancel.set()
+
+    def _progress(self, written: int) -> None:
+        if self._cancel.is_set():
+            raise report_io.ExportCancelled()
+        # sessões gravadas na GUI durante a exportação podem entrar no relatório
+        self.signals.progress.emit(written, max(written, self.total))
+
+    def _rows(self) -> Iterable[Mapping[str, object]]:
+        if self._db is None:
+            return self.rows
+        return (rec for _, rec in self._db.iter_sessions(self.chunk_size))
+
+    def _frame(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self._rows()), columns=self.columns)
+
+    def _export_csv(self, path: str) -> None:
+        report_io.export_csv_stream(self._rows(), path, columns=self.columns, dialect='locale',
+                                    chunk_size=self.chunk_size, progress=self._progress)
+
+    def _export(self, path: str) -> None:
+        if path.endswith('.xlsx'):
+            self._progress(0)
+            df = self._frame()
+            report_io.export_excel(df, path, chunk_size=self.chunk_size, progress=self._progress)
+        elif path.lower().endswith(report_io.COLUMNAR_SUFFIXES):
+            # Formato colunar binário, recarregável com report_io.load_report
+            self._progress(0)
+            df = self._frame()
+            report_io.export_columnar(df, path)
+            self._progress(len(df))
+        else:
+            self._export_csv(path)
+
+    @staticmethod
+    def _write(path: str, export: Callable[[str], None]) -> None:
+        """
+        Grava com `export` em um temporário ao lado de `path` (mesma extensão,
+        que define o formato) e o move para `path` com os.replace.
+        """
+        folder, name = os.path.split(path)
+        stem, ext = os.path.splitext(name)
+        tmp = os.path.join(folder, f".{stem}.{uuid.uuid4().hex[:8]}.tmp{ext}")
+        try:
+            export(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def run(self) -> None:
+        try:
+            if self._db_path is not None:
+                # conexão própria: a do SQLite não pode ser usada em outra thread
+                self._db = SessionDatabase(self._db_path)
+                self.total = self._db.count()
+                self.columns = self._db.columns_with_data(self.columns)
+            try:
+                self._write(self.path, self._export)
+            except report_io.ExportCancelled:
+                raise
+            except Exception as e:
+                # Tentar salvar como CSV se falhar o formato escolhido
+                csv_path = self.path.rsplit('.', 1)[0] + '.csv'
+                self._write(csv_path, self._export_csv)
+                self.signals.finished.emit(
+                    csv_path,
+                    f"Could not save as {_format_name(self.path)} (error: {str(e)}). "
+                    f"Saved as CSV: {csv_path}")
+                return
+            self.signals.finished.emit(self.path, '')
+        except report_io.ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(f"Failed to export data: {str(e)}")
+        finally:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _format_name(path: str) -> str:
+    """Nome do formato de `path` para as mensagens ao usuário."""
+    lower = path.lower()
+    if lower.endswith('.xlsx'):
+        return 'Excel'
+    if lower.endswith(report_io.FEATHER_SUFFIXES):
+        return 'Feather'
+    if lower.endswith(report_io.PARQUET_SUFFIXES):
+        return 'Parquet'
+    return 'CSV'
@@ -0,0 +1,190 @@
+# instrumentation.py
+"""
+Instrumentação opcional de latência para o backend e a GUI.
+
+Ativada pela variável de ambiente TPA_PROFILE=1 no início do processo. Sem
+ela, `instrument` devolve a própria função decorada e `measure` não mede
+nada, então o custo desativado é nulo (ou uma checagem de flag).
+
+Com a instrumentação ativa, cada ponto medido acumula contagem, erros,
+tempo total/mínimo/máximo e um histograma em potências de 2 (µs). Os dados
+podem ser exportados em JSON ou CSV com `export`.
+"""
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, TypeVar, Union
+
+F = TypeVar('F', bound=Callable)
+
+# Número de faixas do histograma: faixa i cobre [2^i, 2^(i+1)) µs
+_BUCKETS = 32
+
+_enabled = os.environ.get('TPA_PROFILE', '').strip() not in ('', '0')
+_lock = threading.Lock()
+
+
+class _Stat:
+    """Estatísticas acumuladas de um ponto medido."""
+
+    __slots__ = ('count', 'errors', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, seconds: float, failed: bool) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        micros = int(seconds * 1e6)
+        self.buckets[min(max(micros.bit_length() - 1, 0), _BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Percentil aproximado (s), pelo limite superior da faixa do histograma."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min(2 ** (i + 1) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total * 1e3,
+            'mean_ms': self.total / self.count * 1e3 if self.count else 0.0,
+            'min_ms': self.min * 1e3 if self.count else 0.0,
+            'max_ms': self.max * 1e3,
+            'p50_ms': self.percentile(0.5) * 1e3,
+            'p95_ms': self.percentile(0.95) * 1e3,
+            'histogram_us': {f"<{2 ** (i + 1)}": n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+_stats: Dict[str, _Stat] = {}
+_counters: Dict[str, int] = {}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """Retoma a coleta (só afeta pontos decorados com TPA_PROFILE ativo)."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Pausa a coleta sem descartar o que já foi medido."""
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+
+
+def record(name: str, seconds: float, failed: bool = False) -> None:
+    """Registra manualmente uma medição de `seconds` para `name`."""
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = _Stat()
+        stat.add(seconds, failed)
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Soma `amount` ao contador `name` (ex.: linhas exportadas)."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """Mede o bloco `with` como um ponto chamado `name`."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        record(name, time.perf_counter() - start, failed)
+
+
+def instrument(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorador que mede cada chamada da função. O nome padrão é
+    `<módulo>.<qualname>`. Sem TPA_PROFILE no início do processo, a função
+    é devolvida sem nenhum invólucro.
+    """
+    def decorator(fn: F) -> F:
+        if not _enabled:
+            return fn
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(label, time.perf_counter() - start, failed)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def snapshot() -> Dict[str, object]:
+    """Cópia das estatísticas atuais: {'timings': {...}, 'counters': {...}}."""
+    with _lock:
+        return {
+            'timings': {name: stat.as_dict() for name, stat in sorted(_stats.items())},
+            'counters': dict(sorted(_counters.items())),
+        }
+
+
+def export(path: Union[str, Path]) -> Path:
+    """
+    Grava o snapshot em `path`: JSON completo, ou CSV (uma linha por ponto,
+    sem o histograma) se a extensão for .csv. Retorna o caminho gravado.
+    """
+    path = Path(path)
+    data = snapshot()
+    if path.suffix.lower() == '.csv':
+        fields = ['name', 'count', 'errors', 'total_ms', 'mean_ms', 'min_ms', 'max_ms', 'p50_ms', 'p95_ms']
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            for name, stat in data['timings'].items():
+                writer.writerow(dict(stat, name=name))
+            for name, value in data['counters'].items():
+                writer.writerow({'name': name, 'count': value})
+    else:
+        path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    return path
@@ -0,0 +1,163 @@
+# pressure_kernel.py
+"""
+Núcleo único do cálculo de correção de pressões, usado pelo backend e pela
+GUI. Opera tanto sobre escalares quanto sobre arrays NumPy (com broadcasting);
+corrected_pressures_float é a mesma fórmula só com floats, para uma sessão.
+Também oferece grades pré-calculadas da correção pela pista (air2 × track2),
+consultadas por interpolação bilinear em tempo constante.
+"""
+from functools import lru_cache
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+# Conversões usadas nas fórmulas
+PSI_PER_BAR = 14.504
+KELVIN_OFFSET = 273.15
+
+
+def corrected_pressures(target, cold, hot, air1, air2, track1, track2
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula as pressões frias corrigidas.
+
+    Args:
+        target, cold, hot: pressões alvo, fria e quente (psi).
+        air1, track1: temperaturas do ar e da pista antes da sessão (°C).
+        air2, track2: temperaturas do ar e da pista depois da sessão (°C).
+        Todos podem ser escalares ou arrays compatíveis por broadcasting.
+
+    Returns:
+        tupla (new_cold, corr_air, corr_track), sem arredondamento:
+          - new_cold: pressão fria corrigida pela razão alvo/quente;
+          - corr_air: new_cold corrigida pela temperatura do ar;
+          - corr_track: new_cold corrigida pela variação da pista.
+        hot == 0 (pressão quente não medida) resulta em new_cold = 0 e
+        corr_air = 0; corr_track parte de new_cold = 0 e só é 0 se
+        track1 == track2.
+    """
+    target = np.asarray(target, dtype=float)
+    cold = np.asarray(cold, dtype=float)
+    hot = np.asarray(hot, dtype=float)
+    air1K = np.asarray(air1, dtype=float) + KELVIN_OFFSET
+    air2K = np.asarray(air2, dtype=float) + KELVIN_OFFSET
+    track1K = np.asarray(track1, dtype=float) + KELVIN_OFFSET
+    track2K = np.asarray(track2, dtype=float) + KELVIN_OFFSET
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_cold = np.where(hot != 0, cold * target / hot, 0.0)
+        corr_air = np.where(air1K != 0, new_cold * air2K / air1K, 0.0)
+        # Gay-Lussac em pressão absoluta (bar): (p+1)·T_ar / (T_ar + ΔT_pista) - 1
+        abs_bar = new_cold / PSI_PER_BAR + 1
+        corr_track = np.where(
+            track1K != 0,
+            (abs_bar * air2K / (air2K + (track2K - track1K)) - 1) * PSI_PER_BAR,
+            0.0)
+    return new_cold, corr_air, corr_track
+
+
+def corrected_pressures_float(target: float, cold: float, hot: float, air1: float,
+                              air2: float, track1: float, track2: float
+                              ) -> Tuple[float, float, float]:
+    """
+    corrected_pressures para um único pneu, em aritmética de float do Python:
+    sem a criação de arrays, que domina o custo com escalares. Mesmas
+    operações, na mesma ordem, então o resultado é idêntico. Divisão por
+    zero (temperaturas no zero absoluto) cai no kernel NumPy, que devolve
+    inf/nan em vez de levantar ZeroDivisionError.
+    """
+    air1K = float(air1) + KELVIN_OFFSET
+    air2K = float(air2) + KELVIN_OFFSET
+    track1K = float(track1) + KELVIN_OFFSET
+    track2K = float(track2) + KELVIN_OFFSET
+    try:
+        new_cold = float(cold) * float(target) / float(hot) if hot != 0 else 0.0
+        corr_air = new_cold * air2K / air1K if air1K != 0 else 0.0
+        abs_bar = new_cold / PSI_PER_BAR + 1
+        corr_track = ((abs_bar * air2K / (air2K + (track2K - track1K)) - 1) * PSI_PER_BAR
+                      if track1K != 0 else 0.0)
+    except ZeroDivisionError:
+        return tuple(float(v) for v in corrected_pressures(target, cold, hot, air1, air2,
+                                                           track1, track2))
+    return new_cold, corr_air, corr_track
+
+
+# Faixas padrão da grade de correção (°C) e passo entre pontos
+AIR2_RANGE = (-10.0, 50.0)
+TRACK2_RANGE = (-5.0, 75.0)
+GRID_STEP = 0.5
+
+
+class CorrectionGrid:
+    """
+    Pressão fria corrigida pela pista (corr_track) pré-calculada em uma grade
+    regular de air2 × track2, para pressões e condições iniciais fixas.
+
+    Os valores têm forma shape + (len(air2), len(track2)), onde shape é a
+    forma das pressões informadas (ex.: (4,) para os quatro pneus). query
+    interpola bilinearmente; fora da grade, os valores são limitados à borda.
+    """
+
+    def __init__(self, target, cold, hot, air1: float, track1: float,
+                 air2_range: Tuple[float, float] = AIR2_RANGE,
+                 track2_range: Tuple[float, float] = TRACK2_RANGE,
+                 step: float = GRID_STEP):
+        if step <= 0:
+            raise ValueError("step deve ser positivo.")
+        self.step = float(step)
+        self.air2 = np.arange(air2_range[0], air2_range[1] + step / 2, step)
+        self.track2 = np.arange(track2_range[0], track2_range[1] + step / 2, step)
+        if len(self.air2) < 2 or len(self.track2) < 2:
+            raise ValueError("A grade precisa de ao menos 2 pontos por eixo.")
+        target, cold, hot = (np.asarray(v, dtype=float)[..., None, None] for v in (target, cold, hot))
+        _, _, values = corrected_pressures(target, cold, hot, air1, self.air2[:, None],
+                                           track1, self.track2[None, :])
+        self.values = values
+        self.values.flags.writeable = False
+
+    @staticmethod
+    def _locate(axis: np.ndarray, step: float, x) -> Tuple[np.ndarray, np.ndarray]:
+        pos = np.clip((np.asarray(x, dtype=float) - axis[0]) / step, 0, len(axis) - 1)
+        i0 = np.minimum(pos.astype(np.intp), len(axis) - 2)
+        return i0, pos - i0
+
+    def query(self, air2, track2) -> np.ndarray:
+        """
+        corr_track interpolado para air2/track2 (escalares ou arrays).
+        Retorna forma shape + forma(air2, track2).
+        """
+        i, fi = self._locate(self.air2, self.step, air2)
+        j, fj = self._locate(self.track2, self.step, track2)
+        v = self.values
+        return ((1 - fi) * (1 - fj) * v[..., i, j] + fi * (1 - fj) * v[..., i + 1, j] +
+                (1 - fi) * fj * v[..., i, j + 1] + fi * fj * v[..., i + 1, j + 1])
+
+
+Pressoes = Union[float, Tuple[float, ...]]
+
+
+@lru_cache(maxsize=32)
+def _cached_grid(target: Pressoes, cold: Pressoes, hot: Pressoes, air1: float, track1: float,
+                 air2_range: Tuple[float, float], track2_range: Tuple[float, float],
+                 step: float) -> CorrectionGrid:
+    return CorrectionGrid(target, cold, hot, air1, track1, air2_range, track2_range, step)
+
+
+def correction_grid(target: Union[float, Sequence[float]],
+                    cold: Union[float, Sequence[float]],
+                    hot: Union[float, Sequence[float]],
+                    air1: float, track1: float,
+                    air2_range: Tuple[float, float] = AIR2_RANGE,
+                    track2_range: Tuple[float, float] = TRACK2_RANGE,
+                    step: float = GRID_STEP) -> CorrectionGrid:
+    """
+    Retorna a CorrectionGrid para estas entradas, reaproveitando a última grade
+    construída com os mesmos valores. Qualquer mudança nas pressões, nas
+    temperaturas iniciais ou na faixa gera uma grade nova.
+    """
+    def key(v):
+        return tuple(float(x) for x in v) if np.ndim(v) else float(v)
+
+    return _cached_grid(key(target), key(cold), key(hot), float(air1), float(track1),
+                        tuple(map(float, air2_range)), tuple(map(float, track2_range)), float(step))
+
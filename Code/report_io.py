@@ -0,0 +1,254 @@
+# report_io.py
+"""
+Rotinas de escrita e leitura de relatórios compartilhadas entre o backend e
+a GUI. A exportação CSV é feita em blocos de tamanho limitado, para que o
+pico de memória não dependa do tamanho do histórico de sessões. Os formatos
+colunares (Feather/Arrow e Parquet) preservam os tipos das colunas e podem
+ser reabertos via memory-map, sem reinterpretar texto.
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+# Dialetos de CSV suportados:
+#   plain  -> separador vírgula e ponto decimal (backend / análise)
+#   locale -> separador ponto e vírgula, vírgula decimal e BOM (Excel pt-BR, GUI)
+CSV_DIALECTS: Dict[str, Dict[str, str]] = {
+    'plain':  {'sep': ',', 'decimal': '.', 'encoding': 'utf-8'},
+    'locale': {'sep': ';', 'decimal': ',', 'encoding': 'utf-8-sig'},
+}
+
+# Número padrão de sessões por bloco gravado
+CHUNK_SIZE = 5000
+
+# Extensões dos formatos colunares binários (dependem de pyarrow)
+FEATHER_SUFFIXES = ('.feather', '.arrow')
+PARQUET_SUFFIXES = ('.parquet',)
+COLUMNAR_SUFFIXES = FEATHER_SUFFIXES + PARQUET_SUFFIXES
+
+# Linhas amostradas por coluna para estimar a largura no Excel
+WIDTH_SAMPLE = 2000
+
+Progress = Callable[[int], None]
+
+
+class ExportCancelled(Exception):
+    """Levantada por um callback de progresso para interromper a exportação."""
+
+
+def chunk_records(rows: Iterable[Mapping[str, object]],
+                  chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Agrupa um iterável de sessões (dicionários) em DataFrames de no máximo
+    chunk_size linhas. Apenas um bloco fica em memória por vez.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser positivo.")
+    buffer: List[Mapping[str, object]] = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= chunk_size:
+            yield pd.DataFrame(buffer)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame(buffer)
+
+
+def write_csv_chunks(chunks: Iterable[pd.DataFrame],
+                     path: Union[str, Path],
+                     columns: Optional[Sequence[str]] = None,
+                     dialect: str = 'plain',
+                     progress: Optional[Progress] = None) -> int:
+    """
+    Grava blocos de DataFrame em um único CSV, na ordem recebida.
+
+    Args:
+        chunks: iterável de DataFrames (ex.: gerado por chunk_records).
+        path: arquivo de destino (sobrescrito).
+        columns: ordem das colunas; se None, usa as colunas do primeiro bloco.
+            Colunas fora da lista são descartadas e as ausentes ficam vazias.
+        dialect: chave de CSV_DIALECTS ('plain' ou 'locale').
+        progress: chamado após cada bloco com o total de linhas já gravadas.
+
+    Returns:
+        número de linhas gravadas.
+    """
+    if dialect not in CSV_DIALECTS:
+        raise ValueError(f"Dialeto de CSV desconhecido: {dialect}")
+    opts = CSV_DIALECTS[dialect]
+    written = 0
+    with open(path, 'w', encoding=opts['encoding'], newline='') as fh:
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+            chunk.reindex(columns=columns).to_csv(
+                fh, index=False, header=written == 0,
+                sep=opts['sep'], decimal=opts['decimal'])
+            written += len(chunk)
+            if progress is not None:
+                progress(written)
+        if written == 0 and columns:
+            pd.DataFrame(columns=list(columns)).to_csv(fh, index=False, sep=opts['sep'])
+    return written
+
+
+def export_csv_stream(rows: Iterable[Mapping[str, object]],
+                      path: Union[str, Path],
+                      columns: Optional[Sequence[str]] = None,
+                      dialect: str = 'plain',
+                      chunk_size: int = CHUNK_SIZE,
+                      progress: Optional[Progress] = None) -> int:
+    """
+    Exporta um gerador de sessões (dicionários) para CSV em blocos de
+    chunk_size linhas. Veja write_csv_chunks para os demais argumentos.
+    """
+    return write_csv_chunks(chunk_records(rows, chunk_size), path,
+                            columns=columns, dialect=dialect, progress=progress)
+
+
+def column_widths(df: pd.DataFrame, sample: int = WIDTH_SAMPLE,
+                  padding: int = 2) -> Dict[str, int]:
+    """
+    Largura de cada coluna (em caracteres) para a planilha: o maior texto
+    entre o cabeçalho e os valores, mais `padding`.
+
+    Até `sample` linhas, todas são medidas (mesmo resultado que medir cada
+    célula). Acima disso, mede uma amostra fixa de linhas mais o mínimo e o
+    máximo das colunas numéricas, onde costumam estar os textos mais longos.
+    """
+    rows = df if len(df) <= sample else df.sample(n=sample, random_state=0)
+    widths: Dict[str, int] = {}
+    for col in df.columns:
+        values = rows[col]
+        if len(rows) < len(df) and pd.api.types.is_numeric_dtype(df[col]):
+            values = pd.concat([values, pd.Series([df[col].min(), df[col].max()])])
+        longest = int(values.astype(str).str.len().max()) if len(values) else 0
+        widths[col] = max(longest, len(str(col))) + padding
+    return widths
+
+
+# Formato das células de data/hora no Excel (o mesmo usado pelo pandas)
+EXCEL_DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+
+def write_excel_chunks(chunks: Iterable[pd.DataFrame],
+                       path: Union[str, Path],
+                       columns: Sequence[str],
+                       widths: Optional[Mapping[str, int]] = None,
+                       datetime_columns: Iterable[str] = (),
+                       sheet_name: str = 'Tire Data',
+                       progress: Optional[Progress] = None) -> int:
+    """
+    Grava blocos de DataFrame em uma planilha .xlsx no modo write-only do
+    openpyxl: as linhas vão direto para o arquivo, sem montar a pasta de
+    trabalho em memória. Larguras e formatos de coluna precisam ser
+    conhecidos antes da primeira linha (veja column_widths).
+
+    Args:
+        chunks: iterável de DataFrames, na ordem das linhas.
+        path: arquivo de destino (sobrescrito).
+        columns: ordem das colunas; as ausentes em um bloco ficam vazias.
+        widths: largura por coluna (caracteres); colunas fora do dicionário
+            ficam com a largura padrão.
+        datetime_columns: colunas gravadas com EXCEL_DATETIME_FORMAT.
+        sheet_name: nome da planilha.
+        progress: chamado após cada bloco com o total de linhas já gravadas;
+            pode levantar ExportCancelled para interromper.
+
+    Returns:
+        número de linhas gravadas.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    columns = list(columns)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    for idx, col in enumerate(columns):
+        if widths and col in widths:
+            ws.column_dimensions[get_column_letter(idx + 1)].width = widths[col]
+    date_cols = set(datetime_columns)
+    dates = [i for i, col in enumerate(columns) if col in date_cols]
+
+    ws.append(columns)
+    written = 0
+    for chunk in chunks:
+        # NaN/NaT viram células vazias, como no to_excel do pandas
+        chunk = chunk.reindex(columns=columns).astype(object)
+        values = chunk.where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if dates:
+                row = list(row)
+                for i in dates:
+                    if row[i] is not None:
+                        cell = WriteOnlyCell(ws, value=row[i])
+                        cell.number_format = EXCEL_DATETIME_FORMAT
+                        row[i] = cell
+            ws.append(row)
+        written += len(chunk)
+        if progress is not None:
+            progress(written)
+    wb.save(path)
+    return written
+
+
+def export_excel(df: pd.DataFrame, path: Union[str, Path],
+                 sheet_name: str = 'Tire Data',
+                 chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[Progress] = None) -> int:
+    """
+    Grava o relatório em .xlsx em uma única planilha, em streaming
+    (write_excel_chunks), com as larguras de column_widths e formato de
+    data nas colunas datetime64.
+
+    Returns:
+        número de linhas gravadas.
+    """
+    dates = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+    return write_excel_chunks(chunks, path, list(df.columns), widths=column_widths(df),
+                              datetime_columns=dates, sheet_name=sheet_name, progress=progress)
+
+
+def export_columnar(df: pd.DataFrame, path: Union[str, Path]) -> None:
+    """
+    Grava o relatório em formato colunar binário conforme a extensão:
+      - .feather / .arrow: Arrow IPC sem compressão (permite memory-map);
+      - .parquet: Parquet (menor em disco, leitura colunar).
+
+    Raises:
+        ModuleNotFoundError: se pyarrow não estiver instalado.
+        ValueError: se a extensão não for colunar.
+    """
+    suffix = Path(path).suffix.lower()
+    df = df.reset_index(drop=True)
+    if suffix in FEATHER_SUFFIXES:
+        df.to_feather(path, compression='uncompressed')
+    elif suffix in PARQUET_SUFFIXES:
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Extensão não colunar: {suffix}")
+
+
+def load_report(path: Union[str, Path],
+                columns: Optional[Sequence[str]] = None,
+                memory_map: bool = True) -> pd.DataFrame:
+    """
+    Carrega um relatório colunar (.feather/.arrow/.parquet) como DataFrame,
+    com os tipos originais (float64, categorias, datetime64).
+    Com memory_map, o arquivo é mapeado em memória em vez de lido por inteiro;
+    `columns` limita a leitura às colunas pedidas.
+    """
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+
+    suffix = Path(path).suffix.lower()
+    if suffix in FEATHER_SUFFIXES:
+        table = feather.read_table(str(path), columns=columns, memory_map=memory_map)
+    elif suffix in PARQUET_SUFFIXES:
+        table = parquet.read_table(str(path), columns=columns, memory_map=memory_map)
+    else:
+        raise ValueError(f"Extensão não colunar: {suffix}")
+    return table.to_pandas(split_blocks=True)
@@ -2,10 +2,23 @@
 """
 Backend module para Gerenciador de Distribuição de Rigidez.
 Contém todas as funções de cálculo que podem ser importadas e usadas pelo front-end.
+
+Todas as funções aceitam `table`: uma ArbTable, o nome de uma tabela do
+registro (arb_tables.registry) ou None para a tabela padrão.
 """
-from typing import List, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from arb_tables import ArbTable, registry
+from instrumentation import instrument
 
-# Tabelas de (posição, rigidez)
+TableRef = Union[ArbTable, str, None]
+
+# Nome da tabela embutida, usada quando nenhuma outra é escolhida
+DEFAULT_TABLE = 'default'
+
+# Tabela embutida do carro padrão: (posição, rigidez)
 _front = [
     (1.0,  9.3),  (1.5, 10.15), (2.0, 11.0), (2.5, 12.65), (3.0, 14.3),
     (3.5, 17.0), (4.0, 19.7),  (4.5, 23.1),  (5.0, 26.5),  (5.5, 28.2),
@@ -17,80 +30,793 @@ _rear  = [
     (6.0, 46.6),  (6.5, 45.05), (7.0, 43.5)
 ]
 
-# Dicionários para lookup rápido posição → rigidez
-_front_dict = dict(_front)
-_rear_dict  = dict(_rear)
+# Posição da asa → variação do balanço aerodinâmico no eixo dianteiro (%)
+_wing = [
+    ('P14', -6.0), ('P13', -5.3), ('P12', -4.6), ('P11', -3.9), ('P10', -3.2),
+    ('P9',  -2.4), ('P8',  -1.6), ('P7',  -0.8), ('P6',   0.0), ('P5',   1.1),
+    ('P4',   2.3)
+]
+
+registry.register(ArbTable(DEFAULT_TABLE, _front, _rear, wing=_wing), default=True)
+
+
+def _resolve(table: TableRef) -> ArbTable:
+    """ArbTable correspondente a `table` (objeto, nome ou None = padrão)."""
+    return table if isinstance(table, ArbTable) else registry.get(table)
+
+
+# Métodos do modelo de rigidez:
+#   strict -> só posições da tabela (tolerância de arredondamento STRICT_ATOL)
+#   linear -> interpolação linear entre as linhas da tabela
+#   pchip  -> spline cúbica monótona por trechos (Fritsch-Carlson), sem
+#             overshoot entre as linhas e respeitando o pico da tabela
+METHODS = ('strict', 'linear', 'pchip')
+STRICT_ATOL = 1e-9
+
+
+def _pchip_slopes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Derivadas nos nós da interpolação PCHIP (mesmo critério do SciPy)."""
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    d = np.zeros_like(y)
+    # nós internos: média harmônica ponderada, zero em extremos locais
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interior = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    d[1:-1] = np.where(same, interior, 0.0)
+
+    def edge(h0, h1, m0, m1):
+        slope = ((2 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        if np.sign(slope) != np.sign(m0):
+            return 0.0
+        if np.sign(m0) != np.sign(m1) and abs(slope) > abs(3 * m0):
+            return 3 * m0
+        return slope
+
+    if len(x) > 2:
+        d[0] = edge(h[0], h[1], delta[0], delta[1])
+        d[-1] = edge(h[-1], h[-2], delta[-1], delta[-2])
+    else:
+        d[:] = delta[0]
+    return d
+
+
+class StiffnessModel:
+    """
+    Rigidez de um eixo em função da posição (média das barras), a partir de
+    uma tabela (posição, rigidez). Avalia escalares ou arrays em uma única
+    chamada vetorizada.
+
+    Fora da faixa da tabela (e, no modo strict, fora das posições tabeladas)
+    levanta ValueError.
+    """
+
+    def __init__(self, tabela: List[Tuple[float, float]], method: str = 'linear'):
+        if method not in METHODS:
+            raise ValueError(f"Método de rigidez desconhecido: {method}")
+        if len(tabela) < 2:
+            raise ValueError("A tabela precisa de ao menos 2 posições.")
+        pos, val = np.array(sorted(tabela), dtype=float).T
+        self.method = method
+        self.positions = pos
+        self.values = val
+        self.slopes = _pchip_slopes(pos, val) if method == 'pchip' else None
+
+    def __call__(self, posicoes) -> np.ndarray:
+        x = np.asarray(posicoes, dtype=float)
+        pos, val = self.positions, self.values
+        outside = (x < pos[0] - STRICT_ATOL) | (x > pos[-1] + STRICT_ATOL) | np.isnan(x)
+        if np.any(outside):
+            raise ValueError(f"Posição fora da tabela: {x[outside].ravel()[0]}")
+        i = np.clip(np.searchsorted(pos, x, side='right') - 1, 0, len(pos) - 2)
+        h = pos[i + 1] - pos[i]
+        t = np.clip((x - pos[i]) / h, 0.0, 1.0)
+
+        if self.method == 'strict':
+            near = np.where(t < 0.5, i, i + 1)
+            missing = np.abs(pos[near] - x) > STRICT_ATOL
+            if np.any(missing):
+                raise ValueError(
+                    f"Média de posição {x[missing].ravel()[0]} não encontrada na tabela.")
+            return val[near]
+        if self.method == 'linear':
+            return val[i] + t * (val[i + 1] - val[i])
+        # Hermite cúbica com as derivadas PCHIP
+        d = self.slopes
+        t2, t3 = t * t, t * t * t
+        return ((2 * t3 - 3 * t2 + 1) * val[i] + (t3 - 2 * t2 + t) * h * d[i] +
+                (-2 * t3 + 3 * t2) * val[i + 1] + (t3 - t2) * h * d[i + 1])
+
+
+def stiffness_model(axle: str = 'front', method: str = 'linear',
+                    table: TableRef = None) -> StiffnessModel:
+    """StiffnessModel (em cache na tabela) do eixo 'front' ou 'rear'."""
+    tbl = _resolve(table)
+    rows = tbl.rows(axle)
+    return tbl.cached(f'model_{axle}_{method}', lambda: StiffnessModel(rows, method))
+
+
+def axle_stiffness(setups, axle: str = 'front', method: str = 'linear',
+                   table: TableRef = None) -> np.ndarray:
+    """
+    Rigidez do eixo para vários setups de uma vez.
+
+    Args:
+        setups: array (..., k) com as k posições de cada setup (ex.: esquerda
+            e direita); a rigidez usa a média do último eixo.
+        axle: 'front' ou 'rear'.
+        method: 'strict', 'linear' ou 'pchip'.
+        table: tabela de ARB (veja o cabeçalho do módulo).
+
+    Returns:
+        array com a forma de setups sem o último eixo.
+    """
+    model = stiffness_model(axle, method, table)
+    return model(np.asarray(setups, dtype=float).mean(axis=-1))
+
+
+class DistributionMatrix(NamedTuple):
+    """Distribuição dianteira (%) de todas as combinações simétricas da tabela."""
+    front: np.ndarray  # posições dianteiras (crescentes)
+    rear: np.ndarray   # posições traseiras (crescentes)
+    pct: np.ndarray    # pct[i, j] = distribuição com front[i] e rear[j]
+    front_index: Dict[float, int]  # posição dianteira -> i
+    rear_index: Dict[float, int]   # posição traseira -> j
+
+
+def _pct_matrix(vf: np.ndarray, vr: np.ndarray) -> np.ndarray:
+    return vf[:, None] / (vf[:, None] + vr[None, :]) * 100
+
+
+def distribution_matrix(table: TableRef = None) -> DistributionMatrix:
+    """
+    Matriz frente × trás da distribuição de rigidez dianteira, calculada uma
+    vez por tabela (vetorizada) e somente leitura. É a fonte do heatmap, de
+    find_setups e de get_distribution.
+
+    Args:
+        table: tabela de ARB (veja o cabeçalho do módulo).
+    """
+    tbl = _resolve(table)
+
+    def build():
+        (pf, vf), (pr, vr) = tbl.arrays['front'], tbl.arrays['rear']
+        pct = _pct_matrix(vf, vr)
+        pct.flags.writeable = False
+        return DistributionMatrix(pf, pr, pct,
+                                  {p: i for i, p in enumerate(pf.tolist())},
+                                  {p: j for j, p in enumerate(pr.tolist())})
+    return tbl.cached('distribution_matrix', build)
+
+
+# Movimentos avaliados na sensibilidade: eixo inteiro (as duas barras) ou
+# uma barra só; a rigidez depende da média do eixo, então FL = FR e RL = RR
+SENSITIVITY_MOVES = ('front', 'rear', 'fl', 'fr', 'rl', 'rr')
+_MOVE_AXLE = {'front': ('front', 2), 'rear': ('rear', 2),
+              'fl': ('front', 1), 'fr': ('front', 1), 'rl': ('rear', 1), 'rr': ('rear', 1)}
+
+
+class Sensitivity(NamedTuple):
+    """Variação da distribuição dianteira (p.p.) por clique, para cada setup."""
+    front: np.ndarray  # posições dianteiras (crescentes)
+    rear: np.ndarray   # posições traseiras (crescentes)
+    moves: Tuple[str, ...]
+    delta: np.ndarray  # delta[m, d, i, j]: movimento moves[m], d=0 (+1 clique) ou 1 (-1)
+
+    def get(self, move: str, clicks: int = 1) -> np.ndarray:
+        """Matriz frente × trás de um movimento (+1 ou -1 clique); NaN fora da tabela."""
+        if clicks not in (1, -1):
+            raise ValueError("clicks deve ser +1 ou -1.")
+        return self.delta[self.moves.index(move), 0 if clicks > 0 else 1]
+
+
+def sensitivity(table: TableRef = None, method: str = 'linear') -> Sensitivity:
+    """
+    Tensor de sensibilidade por diferenças finitas: para cada combinação
+    simétrica (frente, trás), quanto a distribuição dianteira muda com um
+    clique (+1 ou -1 posição da tabela) em cada movimento de
+    SENSITIVITY_MOVES. Movendo uma barra só, a média do eixo fica entre duas
+    posições da tabela e a rigidez vem do StiffnessModel(method); no modo
+    strict esses valores ficam NaN. Movimentos que saem da tabela também
+    ficam NaN. Calculado de uma vez (vetorizado) e mantido em cache.
+
+    Args:
+        table: tabela de ARB (veja o cabeçalho do módulo).
+        method: 'strict', 'linear' ou 'pchip', para os movimentos de uma barra.
+    """
+    tbl = _resolve(table)
+
+    def axle_after(axle: str, bars: int, step: int) -> np.ndarray:
+        # rigidez do eixo depois do clique; NaN se a nova posição não existir
+        pos, val = tbl.arrays[axle]
+        moved = np.arange(len(pos)) + step
+        inside = (moved >= 0) & (moved < len(pos))
+        new_pos = pos[np.clip(moved, 0, len(pos) - 1)]
+        if bars == 2:
+            out = val[np.clip(moved, 0, len(pos) - 1)].copy()
+        elif method == 'strict':
+            # a média fica entre duas posições: nunca está na tabela
+            out = np.full(len(pos), np.nan)
+        else:
+            out = stiffness_model(axle, method, tbl)((pos + new_pos) / 2)
+        out[~inside] = np.nan
+        return out
+
+    def build():
+        m = distribution_matrix(tbl)
+        vf, vr = tbl.arrays['front'][1], tbl.arrays['rear'][1]
+        delta = np.empty((len(SENSITIVITY_MOVES), 2, len(vf), len(vr)))
+        for k, move in enumerate(SENSITIVITY_MOVES):
+            axle, bars = _MOVE_AXLE[move]
+            for d, step in enumerate((1, -1)):
+                new = axle_after(axle, bars, step)
+                if axle == 'front':
+                    pct = _pct_matrix(new, vr)
+                else:
+                    pct = _pct_matrix(vf, new)
+                delta[k, d] = pct - m.pct
+        delta.flags.writeable = False
+        return Sensitivity(m.front, m.rear, SENSITIVITY_MOVES, delta)
+    return tbl.cached(f'sensitivity_{method}', build)
+
+
+class _DistributionIndex(NamedTuple):
+    """Todas as combinações (frente, trás) ordenadas pela distribuição."""
+    pct: np.ndarray    # distribuição dianteira (%), crescente
+    front: np.ndarray  # posição dianteira de cada combinação
+    rear: np.ndarray   # posição traseira de cada combinação
+    order: np.ndarray  # posição da combinação na enumeração frente × trás
+
+
+def _build_index(pf: np.ndarray, pr: np.ndarray, matrix: np.ndarray) -> _DistributionIndex:
+    pct = matrix.ravel()
+    order = np.argsort(pct, kind='stable')
+    front = np.repeat(pf, len(pr))
+    rear = np.tile(pr, len(pf))
+    return _DistributionIndex(pct[order], front[order], rear[order], order)
+
+
+def _distribution_index(table: ArbTable) -> _DistributionIndex:
+    def build():
+        m = distribution_matrix(table)
+        return _build_index(m.front, m.rear, m.pct)
+    return table.cached('distribution_index', build)
+
+
+def _window_slice(index: _DistributionIndex, target_pct: float,
+                  tol_pct: float) -> Tuple[slice, np.ndarray, np.ndarray]:
+    """
+    Localiza as combinações com |pct - target| <= tol.
+    Retorna (janela, posições dentro da janela, desvio de cada uma).
+    """
+    # janela por busca binária, com folga para arredondamento; o filtro
+    # exato abaixo reproduz a comparação da busca linear
+    slack = 1e-9 * max(1.0, abs(target_pct))
+    lo = np.searchsorted(index.pct, target_pct - tol_pct - slack, side='left')
+    hi = np.searchsorted(index.pct, target_pct + tol_pct + slack, side='right')
+    dev = np.abs(index.pct[lo:hi] - target_pct)
+    keep = np.flatnonzero(dev <= tol_pct)
+    return slice(lo, hi), keep, dev[keep]
+
+
+def _rank(index: _DistributionIndex, win: slice, keep: np.ndarray, dev: np.ndarray,
+          k: Optional[int] = None) -> np.ndarray:
+    """
+    Posições (na janela) das combinações de `keep` em ordem de menor desvio;
+    empates na ordem da enumeração frente × trás. Com k, só as k primeiras,
+    por seleção parcial (np.partition) em vez de ordenar todas.
+    """
+    order = index.order[win][keep]
+    if k is not None and k < len(keep):
+        if k <= 0:
+            return keep[:0]
+        kth = np.partition(dev, k - 1)[k - 1]
+        sel = np.flatnonzero(dev <= kth)  # inclui os empates com o k-ésimo
+        return keep[sel[np.lexsort((order[sel], dev[sel]))][:k]]
+    return keep[np.lexsort((order, dev))]
+
+
+def _rows(index: _DistributionIndex, win: slice,
+          ranked: np.ndarray) -> List[Tuple[float, float, float]]:
+    return list(zip(index.front[win][ranked].tolist(),
+                    index.rear[win][ranked].tolist(),
+                    index.pct[win][ranked].tolist()))
+
+
+def _window(index: _DistributionIndex, target_pct: float, tol_pct: float,
+            k: Optional[int] = None) -> List[Tuple[float, float, float]]:
+    """Combinações com |pct - target| <= tol, ordenadas pelo menor desvio."""
+    win, keep, dev = _window_slice(index, target_pct, tol_pct)
+    return _rows(index, win, _rank(index, win, keep, dev, k))
+
+
+class SetupCursor:
+    """
+    Resultados de find_setups entregues em páginas, na mesma ordem, sem
+    montar a lista completa. A primeira página usa seleção parcial; o
+    ranking completo (só índices) é feito uma vez, se outra página for pedida.
+    """
+
+    def __init__(self, target_pct: float, tol_pct: float,
+                 table: TableRef = None, page_size: int = 50):
+        if page_size < 1:
+            raise ValueError("page_size deve ser positivo.")
+        self._index = _distribution_index(_resolve(table))
+        self._win, self._keep, self._dev = _window_slice(self._index, target_pct, tol_pct)
+        self._ranked: Optional[np.ndarray] = None
+        self.page_size = page_size
+        self.total = len(self._keep)
+        self.offset = 0
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset < self.total
+
+    def fetch(self, n: Optional[int] = None) -> List[Tuple[float, float, float]]:
+        """Próximas n (padrão page_size) combinações; lista vazia no fim."""
+        stop = min(self.offset + (n or self.page_size), self.total)
+        if self._ranked is None:
+            if self.offset == 0 and stop < self.total:
+                ranked = _rank(self._index, self._win, self._keep, self._dev, stop)
+                self.offset = stop
+                return _rows(self._index, self._win, ranked)
+            self._ranked = _rank(self._index, self._win, self._keep, self._dev)
+        page = self._ranked[self.offset:stop]
+        self.offset = stop
+        return _rows(self._index, self._win, page)
+
 
+class _AxlePairs(NamedTuple):
+    """Pares (esquerda, direita) de um eixo agrupados pela média das posições."""
+    left: np.ndarray       # posição esquerda de cada par, agrupada por média
+    right: np.ndarray      # posição direita de cada par
+    start: np.ndarray      # início do grupo de cada média em left/right
+    count: np.ndarray      # número de pares de cada média
+    means: np.ndarray      # média de cada grupo (crescente)
+    stiffness: np.ndarray  # rigidez do eixo para cada média
 
-def _calcula_rigidez(posicoes: List[float], tabela_dict: dict) -> float:
+
+def _build_axle_pairs(table: ArbTable, axle: str, method: str) -> _AxlePairs:
+    pos = table.positions(axle)
+    left = np.repeat(pos, len(pos))
+    right = np.tile(pos, len(pos))
+    mean = (left + right) / 2
+    if method == 'strict':
+        # mesma regra de StiffnessModel: a média precisa ser uma posição da
+        # tabela; compara com a posição mais próxima, de qualquer lado (0.1 + 0.2
+        # dá 0.30000000000000004, logo após a posição 0.3)
+        idx = np.clip(np.searchsorted(pos, mean), 1, len(pos) - 1)
+        near = np.where(mean - pos[idx - 1] <= pos[idx] - mean, idx - 1, idx)
+        valid = np.flatnonzero(np.abs(pos[near] - mean) <= STRICT_ATOL)
+        means, group = pos, near[valid]
+    else:
+        # com interpolação todo par é válido; uma média por valor distinto
+        valid = np.arange(len(mean))
+        means, group = np.unique(mean, return_inverse=True)
+    order = valid[np.argsort(group, kind='stable')]
+    count = np.bincount(group, minlength=len(means))
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    stiffness = stiffness_model(axle, method, table)(means)
+    return _AxlePairs(left[order], right[order], start, count, means, stiffness)
+
+
+def _corner_search(table: ArbTable,
+                   method: str) -> Tuple[_AxlePairs, _AxlePairs, _DistributionIndex]:
+    def build():
+        front = _build_axle_pairs(table, 'front', method)
+        rear = _build_axle_pairs(table, 'rear', method)
+        index = _build_index(front.means, rear.means,
+                             _pct_matrix(front.stiffness, rear.stiffness))
+        return front, rear, index
+    return table.cached(f'corner_search_{method}', build)
+
+
+def _calcula_rigidez(posicoes: List[float], tabela_dict: dict, axle: str = 'front',
+                     method: str = 'strict', table: TableRef = None) -> float:
     """
     Retorna a rigidez de um eixo a partir das posições informadas.
 
     Args:
         posicoes: lista com duas posições (ex: [2.0, 2.5]).
         tabela_dict: dicionário posição→rigidez.
+        axle: eixo da tabela ('front' ou 'rear'), usado fora do lookup direto.
+        method: 'strict' (só posições da tabela), 'linear' ou 'pchip'.
+        table: tabela de ARB de onde veio tabela_dict.
 
     Returns:
         valor de rigidez correspondente.
 
     Raises:
-        ValueError: se a média das posições não estiver na tabela.
+        ValueError: no modo strict, se a média das posições não estiver na
+            tabela; em qualquer modo, se estiver fora da faixa da tabela.
     """
     media = sum(posicoes) / len(posicoes)
-    if media not in tabela_dict:
-        raise ValueError(f"Média de posição {media} não encontrada na tabela.")
-    return tabela_dict[media]
+    if media in tabela_dict:
+        return tabela_dict[media]
+    return float(stiffness_model(axle, method, table)(media))
 
 
-def get_rigidez(front_setup: List[float], rear_setup: List[float]) -> Tuple[float, float]:
+def get_rigidez(front_setup: List[float], rear_setup: List[float],
+                method: str = 'strict', table: TableRef = None) -> Tuple[float, float]:
     """
     Calcula a rigidez de cada eixo (dianteiro e traseiro).
 
     Args:
         front_setup: posições das barras dianteiras (ex: [2.0, 2.5]).
         rear_setup: posições das barras traseiras (ex: [6.0, 6.5]).
+        method: 'strict', 'linear' ou 'pchip' (veja StiffnessModel).
+        table: tabela de ARB (veja o cabeçalho do módulo).
 
     Returns:
         tupla (rigidez_dianteira, rigidez_traseira).
     """
-    rig_f = _calcula_rigidez(front_setup, _front_dict)
-    rig_r = _calcula_rigidez(rear_setup, _rear_dict)
+    tbl = _resolve(table)
+    rig_f = _calcula_rigidez(front_setup, tbl.front_dict, 'front', method, tbl)
+    rig_r = _calcula_rigidez(rear_setup, tbl.rear_dict, 'rear', method, tbl)
     return rig_f, rig_r
 
 
-def get_distribution(front_setup: List[float], rear_setup: List[float]) -> float:
+@instrument()
+def get_distribution(front_setup: List[float], rear_setup: List[float],
+                     method: str = 'strict', table: TableRef = None) -> float:
     """
     Calcula o percentual de distribuição da rigidez dianteira sobre o total.
 
     Args:
         front_setup: posições das barras dianteiras.
         rear_setup: posições das barras traseiras.
+        method: 'strict', 'linear' ou 'pchip' (veja StiffnessModel).
+        table: tabela de ARB (veja o cabeçalho do módulo).
 
     Returns:
         percentual de rigidez dianteira (0-100).
     """
-    rig_f, rig_r = get_rigidez(front_setup, rear_setup)
+    tbl = _resolve(table)
+    m = distribution_matrix(tbl)
+    # médias que são posições da tabela saem direto da matriz
+    i = m.front_index.get(sum(front_setup) / len(front_setup))
+    j = m.rear_index.get(sum(rear_setup) / len(rear_setup))
+    if i is not None and j is not None:
+        return float(m.pct[i, j])
+    rig_f, rig_r = get_rigidez(front_setup, rear_setup, method, tbl)
     return rig_f / (rig_f + rig_r) * 100
 
 
-def find_setups(target_pct: float, tol_pct: float) -> List[Tuple[float, float, float]]:
+@instrument()
+def find_setups(target_pct: float, tol_pct: float,
+                table: TableRef = None) -> List[Tuple[float, float, float]]:
     """
     Encontra todas as combinações de posições (frente, trás) cuja distribuição
     de rigidez do eixo dianteiro esteja dentro de target ± tol.
 
+    Usa um índice com todas as combinações ordenadas por distribuição
+    (construído uma vez) e busca binária: O(log n + k).
+
     Args:
         target_pct: percentual desejado (0-100).
         tol_pct: tolerância em ponto percentual.
+        table: tabela de ARB (veja o cabeçalho do módulo).
 
     Returns:
         lista de tuplas (pos_frente, pos_traseira, distribuição_calculada),
         ordenadas pelo menor desvio em relação ao target.
     """
-    resultados: List[Tuple[float, float, float]] = []
-    for pf, vf in _front:
-        for pr, vr in _rear:
-            pct = vf / (vf + vr) * 100
-            if abs(pct - target_pct) <= tol_pct:
-                resultados.append((pf, pr, pct))
-    resultados.sort(key=lambda x: abs(x[2] - target_pct))
-    return resultados
+    return _window(_distribution_index(_resolve(table)), target_pct, tol_pct)
+
+
+def find_setups_topk(target_pct: float, tol_pct: float, k: int,
+                     table: TableRef = None) -> List[Tuple[float, float, float]]:
+    """
+    As k melhores combinações de find_setups (mesma ordem), por seleção
+    parcial: O(log n + m) para m combinações na tolerância, mais k·log k.
+    Para percorrer o restante em páginas, use SetupCursor.
+    """
+    return _window(_distribution_index(_resolve(table)), target_pct, tol_pct, k)
+
+
+def find_setups_batch(targets_pct: Iterable[float], tol_pct: float,
+                      table: TableRef = None) -> List[List[Tuple[float, float, float]]]:
+    """
+    Versão em lote de find_setups, para varrer uma faixa de balanço.
+
+    Args:
+        targets_pct: percentuais desejados (0-100).
+        tol_pct: tolerância em ponto percentual, comum a todos.
+        table: tabela de ARB (veja o cabeçalho do módulo).
+
+    Returns:
+        uma lista de resultados por target, na mesma ordem e formato de find_setups.
+    """
+    index = _distribution_index(_resolve(table))
+    return [_window(index, float(t), tol_pct) for t in targets_pct]
+
+
+@instrument()
+def find_setups_per_corner(target_pct: float, tol_pct: float,
+                           limit: Optional[int] = None,
+                           method: str = 'strict', table: TableRef = None
+                           ) -> List[Tuple[float, float, float, float, float]]:
+    """
+    Busca com posições independentes por canto (FL, FR, RL, RR), para
+    setups assimétricos entre esquerda e direita.
+
+    A rigidez de cada eixo depende só da média das duas posições, então a
+    busca é feita primeiro entre as médias (índice ordenado, como em
+    find_setups) e apenas os pares de médias dentro da tolerância são
+    expandidos para as combinações por canto. No modo strict só entram pares
+    cuja média é uma posição da tabela; com 'linear' ou 'pchip', todos.
+
+    Args:
+        target_pct: percentual desejado (0-100).
+        tol_pct: tolerância em ponto percentual.
+        limit: número máximo de resultados (None = todos).
+        method: 'strict', 'linear' ou 'pchip' (veja StiffnessModel).
+        table: tabela de ARB (veja o cabeçalho do módulo).
+
+    Returns:
+        lista de tuplas (fl, fr, rl, rr, distribuição_calculada), ordenadas
+        pelo menor desvio; em empate, pela menor assimetria |FL-FR| + |RL-RR|.
+    """
+    front, rear, index = _corner_search(_resolve(table), method)
+    win, keep, dev = _window_slice(index, target_pct, tol_pct)
+    enum = index.order[win][keep]
+    fi, ri = np.divmod(enum, len(rear.means))
+
+    # expansão vetorizada: cada par de médias gera count_f × count_r combinações
+    nf, nr = front.count[fi], rear.count[ri]
+    sizes = nf * nr
+    match = np.repeat(np.arange(len(enum)), sizes)
+    local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    f_pair = front.start[fi][match] + local // nr[match]
+    r_pair = rear.start[ri][match] + local % nr[match]
+
+    fl, fr = front.left[f_pair], front.right[f_pair]
+    rl, rr = rear.left[r_pair], rear.right[r_pair]
+    asym = np.abs(fl - fr) + np.abs(rl - rr)
+    ranked = np.lexsort((local, enum[match], asym, dev[match]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    pct = index.pct[win][keep][match]
+    return list(zip(fl[ranked].tolist(), fr[ranked].tolist(),
+                    rl[ranked].tolist(), rr[ranked].tolist(), pct[ranked].tolist()))
+
+
+# Passo padrão da grade de alta resolução (posições contínuas ou de 0,1)
+HIGHRES_STEP = 0.01
+
+
+class HighResResult(NamedTuple):
+    """Resultado de find_setups_highres."""
+    total: int  # número de combinações dentro da tolerância
+    setups: List[Tuple[float, float, float]]  # as melhores (frente, trás, distribuição)
+
+
+class _HighResGrid(NamedTuple):
+    front: np.ndarray      # posições dianteiras da grade
+    vf: np.ndarray         # rigidez dianteira de cada posição
+    rear: np.ndarray       # posições traseiras, ordenadas pela rigidez
+    vr: np.ndarray         # rigidez traseira, crescente
+    rear_rank: np.ndarray  # ordem de cada posição traseira na grade original
+
+
+def _highres_grid(table: ArbTable, step: float, method: str) -> _HighResGrid:
+    def axis(axle: str) -> Tuple[np.ndarray, np.ndarray]:
+        pos = table.positions(axle)
+        n = int(round((pos[-1] - pos[0]) / step)) + 1
+        grid = np.round(np.linspace(pos[0], pos[-1], n), 9)
+        return grid, stiffness_model(axle, method, table)(grid)
+
+    def build():
+        pf, vf = axis('front')
+        pr, vr = axis('rear')
+        order = np.argsort(vr, kind='stable')
+        return _HighResGrid(pf, vf, pr[order], vr[order], np.argsort(order))
+    return table.cached(f'highres_{step!r}_{method}', build)
+
+
+def _highres_windows(g: _HighResGrid, target_pct: float,
+                     tol_pct: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Para cada posição dianteira, o intervalo [start, stop) de g.vr com
+    |distribuição - target| <= tol. A distribuição cai com a rigidez
+    traseira, então o intervalo é contíguo e sai por busca binária nos
+    limites de rigidez; as bordas são conferidas com a comparação exata.
+    """
+    lo, hi = target_pct - tol_pct, target_pct + tol_pct
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vr_max = g.vf * (100 - lo) / lo if lo > 0 else np.full_like(g.vf, np.inf)
+        vr_min = g.vf * (100 - hi) / hi if hi < 100 else np.full_like(g.vf, -np.inf)
+    # folga relativa para o arredondamento dos limites; corrigida abaixo
+    start = np.searchsorted(g.vr, vr_min - 1e-12 * np.abs(vr_min), side='left')
+    stop = np.searchsorted(g.vr, vr_max + 1e-12 * np.abs(vr_max), side='right')
+
+    def outside(k: np.ndarray) -> np.ndarray:
+        pct = g.vf / (g.vf + g.vr[np.minimum(k, len(g.vr) - 1)]) * 100
+        return np.abs(pct - target_pct) > tol_pct
+
+    while True:
+        fix = (start < stop) & outside(start)
+        if not fix.any():
+            break
+        start += fix
+    while True:
+        fix = (start < stop) & outside(stop - 1)
+        if not fix.any():
+            break
+        stop -= fix
+    return start, np.maximum(stop, start)
+
+
+@instrument()
+def find_setups_highres(target_pct: float, tol_pct: float, limit: int = 100,
+                        step: float = HIGHRES_STEP, method: str = 'pchip',
+                        table: TableRef = None) -> HighResResult:
+    """
+    Busca target ± tol em barras de alta resolução (posições contínuas ou em
+    passos finos), onde frente × trás passa de 10⁶ combinações.
+
+    A rigidez é avaliada pelo StiffnessModel em uma grade com o passo dado
+    (em cache por tabela). As combinações nunca são enumeradas: para cada
+    posição dianteira, a faixa de rigidez traseira aceitável sai por busca
+    binária na rigidez traseira ordenada. Para as `limit` melhores, o desvio
+    máximo é ajustado por bisseção até a contagem caber em poucos múltiplos
+    de limit, e só essas combinações são materializadas e ordenadas.
+
+    Args:
+        target_pct: percentual desejado (0-100).
+        tol_pct: tolerância em ponto percentual.
+        limit: número máximo de setups devolvidos.
+        step: passo das posições na grade (ajustado para dividir a faixa
+            da tabela em partes iguais).
+        method: 'linear' ou 'pchip' (veja StiffnessModel).
+        table: tabela de ARB (veja o cabeçalho do módulo).
+
+    Returns:
+        HighResResult(total, setups), com setups ordenados pelo menor desvio
+        (empates pela posição dianteira e depois traseira).
+    """
+    if step <= 0:
+        raise ValueError("step deve ser positivo.")
+    if method == 'strict':
+        raise ValueError("A busca de alta resolução exige interpolação ('linear' ou 'pchip').")
+    g = _highres_grid(_resolve(table), float(step), method)
+    start, stop = _highres_windows(g, target_pct, tol_pct)
+    total = int((stop - start).sum())
+    if total == 0 or limit <= 0:
+        return HighResResult(total, [])
+
+    # desvio máximo d tal que a contagem fique entre limit e 4·limit
+    if total > 4 * limit:
+        d_lo, d_hi = 0.0, tol_pct
+        for _ in range(60):
+            d = (d_lo + d_hi) / 2
+            s, e = _highres_windows(g, target_pct, d)
+            count = int((e - s).sum())
+            if count < limit:
+                d_lo = d
+            else:
+                start, stop, d_hi = s, e, d
+                if count <= 4 * limit:
+                    break
+
+    sizes = stop - start
+    fi = np.repeat(np.arange(len(g.vf)), sizes)
+    k = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes) + start[fi]
+    pct = g.vf[fi] / (g.vf[fi] + g.vr[k]) * 100
+    ranked = np.lexsort((g.rear_rank[k], fi, np.abs(pct - target_pct)))[:limit]
+    setups = list(zip(g.front[fi[ranked]].tolist(), g.rear[k[ranked]].tolist(),
+                      pct[ranked].tolist()))
+    return HighResResult(total, setups)
+
+
+def wing_table(table: TableRef = None) -> List[Tuple[str, float]]:
+    """Mapa da asa da tabela: lista de (posição, balanço aerodinâmico %)."""
+    return list(_resolve(table).wing)
+
+
+class BalancedSetup(NamedTuple):
+    """Candidato da busca conjunta ARB × asa."""
+    front: float     # posição da ARB dianteira
+    rear: float      # posição da ARB traseira
+    wing: str        # posição da asa
+    mech_pct: float  # distribuição de rigidez dianteira (%)
+    aero_pct: float  # balanço aerodinâmico no eixo dianteiro (%)
+    clicks: int      # mudanças em relação ao baseline (0 sem baseline)
+
+
+class _WingGrid(NamedTuple):
+    """Todas as combinações ARB frente × trás × asa, achatadas."""
+    fi: np.ndarray
+    ri: np.ndarray
+    wi: np.ndarray
+    mech: np.ndarray
+    aero: np.ndarray
+
+
+def _wing_grid(table: ArbTable) -> _WingGrid:
+    def build():
+        m = distribution_matrix(table)
+        aero = np.array([v for _, v in table.wing], dtype=float)
+        fi, ri, wi = (a.ravel() for a in np.meshgrid(
+            np.arange(len(m.front)), np.arange(len(m.rear)), np.arange(len(aero)), indexing='ij'))
+        return _WingGrid(fi, ri, wi, m.pct[fi, ri], aero[wi])
+    return table.cached('wing_grid', build)
+
+
+def _pareto_mask(costs: np.ndarray) -> np.ndarray:
+    """
+    Máscara das linhas não dominadas de `costs` (n × k, menor é melhor).
+    A dominância é avaliada só entre vetores de custo distintos; linhas
+    empatadas entram ou saem juntas.
+    """
+    unique, inverse = np.unique(costs, axis=0, return_inverse=True)
+    keep = np.ones(len(unique), dtype=bool)
+    # unique vem em ordem lexicográfica: um vetor só pode ser dominado por anteriores
+    for i in range(len(unique)):
+        if keep[i]:
+            rest = unique[i + 1:]
+            dominated = np.all(unique[i] <= rest, axis=1) & np.any(unique[i] < rest, axis=1)
+            keep[i + 1:] &= ~dominated
+    return keep[inverse.ravel()]
+
+
+@instrument()
+def find_balanced_setups(mech_target_pct: float, aero_target_pct: float,
+                         baseline: Optional[Tuple[float, float, str]] = None,
+                         limit: Optional[int] = None,
+                         table: TableRef = None) -> List[BalancedSetup]:
+    """
+    Busca conjunta de setups de ARB (simétricos) × posição da asa, para
+    equilibrar balanço mecânico e aerodinâmico juntos.
+
+    Cada candidato é avaliado por |distribuição - mech_target|,
+    |balanço aero - aero_target| e, com baseline, pelo número de cliques de
+    mudança (passos de ARB dianteira, traseira e asa). Retorna a fronteira de
+    Pareto desses critérios: nenhum candidato devolvido é pior em todos
+    eles que outro. A avaliação é vetorizada sobre todo o produto cartesiano
+    (em cache por tabela), então pode ser refeita a cada ajuste de alvo.
+
+    Args:
+        mech_target_pct: distribuição de rigidez dianteira desejada (0-100).
+        aero_target_pct: balanço aerodinâmico dianteiro desejado (%).
+        baseline: setup atual (pos_frente, pos_traseira, posição_asa), opcional.
+        limit: número máximo de resultados (None = toda a fronteira).
+        table: tabela de ARB (veja o cabeçalho do módulo).
+
+    Returns:
+        lista de BalancedSetup da fronteira, ordenada pela soma dos desvios
+        e depois pelo número de cliques.
+
+    Raises:
+        ValueError: se a tabela não tiver mapa de asa ou o baseline não
+            estiver na tabela.
+    """
+    tbl = _resolve(table)
+    if not tbl.wing:
+        raise ValueError(f"Tabela {tbl.name} não tem mapa de asa.")
+    m = distribution_matrix(tbl)
+    g = _wing_grid(tbl)
+    mech_dev = np.abs(g.mech - mech_target_pct)
+    aero_dev = np.abs(g.aero - aero_target_pct)
+    costs = [mech_dev, aero_dev]
+    clicks = np.zeros(len(g.fi), dtype=int)
+    if baseline is not None:
+        f0, r0, w0 = baseline
+        try:
+            i0, j0 = m.front_index[float(f0)], m.rear_index[float(r0)]
+            k0 = [p for p, _ in tbl.wing].index(w0)
+        except (KeyError, ValueError):
+            raise ValueError(f"Baseline fora da tabela: {baseline}") from None
+        clicks = np.abs(g.fi - i0) + np.abs(g.ri - j0) + np.abs(g.wi - k0)
+        costs.append(clicks)
+
+    front = np.flatnonzero(_pareto_mask(np.column_stack(costs)))
+    ranked = front[np.lexsort((clicks[front], mech_dev[front] + aero_dev[front]))]
+    if limit is not None:
+        ranked = ranked[:limit]
+    labels = [p for p, _ in tbl.wing]
+    return [BalancedSetup(float(m.front[g.fi[k]]), float(m.rear[g.ri[k]]), labels[g.wi[k]],
+                          float(g.mech[k]), float(g.aero[k]), int(clicks[k]))
+            for k in ranked.tolist()]
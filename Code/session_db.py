@@ -0,0 +1,191 @@
+# session_db.py
+"""
+Persistência local das sessões em SQLite (modo WAL).
+Usado pelo backend e pela GUI para manter o histórico entre execuções.
+"""
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+Valor = Union[str, float, datetime]
+
+# Campos sempre indexados, além dos campos de setup informados na inserção
+_BASE_COLUMNS = {'session_name': 'TEXT', 'timestamp': 'TEXT'}
+
+
+def _quote(name: str) -> str:
+    """Escapa um nome de coluna/índice para uso em SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql(value: Valor) -> Union[str, float, None]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, str):
+        return value
+    return float(value)
+
+
+class SessionDatabase:
+    """
+    Tabela `sessions` com uma coluna por campo de sessão. Colunas novas são
+    criadas sob demanda (REAL para números, TEXT para strings), com índices
+    em session_name, timestamp e nos campos de setup.
+
+    A abertura só lê o esquema (PRAGMA table_info), então o custo não depende
+    do tamanho do histórico. Leituras são paginadas pelo id (keyset), que usa
+    a chave primária em vez de OFFSET.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+        self._columns: Dict[str, str] = {
+            row[1]: row[2] for row in self._conn.execute("PRAGMA table_info(sessions)")
+        }
+        with self._conn:
+            for name, sql_type in _BASE_COLUMNS.items():
+                self._add_column(name, sql_type, indexed=True)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'SessionDatabase':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _add_column(self, name: str, sql_type: str, indexed: bool) -> None:
+        if name not in self._columns:
+            self._conn.execute(f"ALTER TABLE sessions ADD COLUMN {_quote(name)} {sql_type}")
+            self._columns[name] = sql_type
+        if indexed:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote('idx_sessions_' + name)} "
+                f"ON sessions ({_quote(name)})")
+
+    def _ensure_columns(self, records: Sequence[Mapping[str, Valor]],
+                        indexed: Iterable[str]) -> None:
+        indexed = set(indexed)
+        for rec in records:
+            for key, value in rec.items():
+                if key not in self._columns or key in indexed:
+                    sql_type = 'TEXT' if isinstance(value, (str, datetime)) else 'REAL'
+                    self._add_column(key, sql_type, key in indexed)
+            indexed.difference_update(rec)
+
+    def insert(self, record: Mapping[str, Valor], indexed: Iterable[str] = ()) -> int:
+        """
+        Grava uma sessão e retorna seu id.
+        indexed: campos (ex.: setup) que devem ganhar índice próprio.
+        """
+        return self.insert_many([record], indexed)[0]
+
+    def insert_many(self, records: Iterable[Mapping[str, Valor]],
+                    indexed: Iterable[str] = ()) -> List[int]:
+        """
+        Grava várias sessões em uma única transação e retorna os ids gerados.
+        Sessões com o mesmo conjunto de campos são inseridas com executemany.
+        """
+        records = list(records)
+        ids: List[int] = []
+        with self._conn:
+            self._ensure_columns(records, indexed)
+            start = 0
+            while start < len(records):
+                keys = tuple(records[start])
+                stop = start
+                while stop < len(records) and tuple(records[stop]) == keys:
+                    stop += 1
+                cols = ', '.join(_quote(k) for k in keys)
+                marks = ', '.join('?' for _ in keys)
+                sql = (f"INSERT INTO sessions ({cols}) VALUES ({marks})" if keys
+                       else "INSERT INTO sessions DEFAULT VALUES")
+                rows = [tuple(_to_sql(rec[k]) for k in keys) for rec in records[start:stop]]
+                first = self._last_id()
+                self._conn.executemany(sql, rows)
+                ids.extend(range(first + 1, first + 1 + len(rows)))
+                start = stop
+        return ids
+
+    def _last_id(self) -> int:
+        # AUTOINCREMENT garante ids crescentes a partir do último já usado
+        row = self._conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'sessions'").fetchone()
+        return row[0] if row else 0
+
+    def update(self, session_id: int, fields: Mapping[str, Valor]) -> None:
+        """Altera campos de uma sessão existente."""
+        if not fields:
+            return
+        with self._conn:
+            self._ensure_columns([fields], ())
+            assigns = ', '.join(f"{_quote(k)} = ?" for k in fields)
+            self._conn.execute(f"UPDATE sessions SET {assigns} WHERE id = ?",
+                               [_to_sql(v) for v in fields.values()] + [session_id])
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def columns_with_data(self, names: Iterable[str]) -> List[str]:
+        """Dos campos `names` (na ordem dada), os que têm valor em alguma sessão."""
+        return [name for name in names if name in self._columns and self._conn.execute(
+            f"SELECT EXISTS (SELECT 1 FROM sessions WHERE {_quote(name)} IS NOT NULL)"
+        ).fetchone()[0]]
+
+    def fetch_page(self, after_id: int = 0, limit: int = 100,
+                   session_name: Optional[str] = None) -> List[Tuple[int, Dict[str, Valor]]]:
+        """
+        Retorna até `limit` sessões com id > after_id, em ordem de id, como
+        pares (id, sessão). Campos nulos são omitidos. Para a próxima página,
+        passe o id do último item como after_id.
+        """
+        sql = "SELECT * FROM sessions WHERE id > ?"
+        params: List[Union[int, str]] = [after_id]
+        if session_name is not None:
+            sql += " AND session_name = ?"
+            params.append(session_name)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        return self._records(self._conn.execute(sql, params))
+
+    def fetch_last(self, limit: int = 100,
+                   before_id: Optional[int] = None) -> List[Tuple[int, Dict[str, Valor]]]:
+        """
+        Retorna as últimas `limit` sessões com id < before_id (todas, se None),
+        em ordem de id. Para a página anterior, passe o id do primeiro item.
+        """
+        sql = "SELECT * FROM sessions"
+        params: List[int] = []
+        if before_id is not None:
+            sql += " WHERE id < ?"
+            params.append(before_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        page = self._records(self._conn.execute(sql, params))
+        page.reverse()
+        return page
+
+    @staticmethod
+    def _records(cursor: sqlite3.Cursor) -> List[Tuple[int, Dict[str, Valor]]]:
+        names = [d[0] for d in cursor.description]
+        return [(row[0], {k: v for k, v in zip(names[1:], row[1:]) if v is not None})
+                for row in cursor]
+
+    def iter_sessions(self, page_size: int = 1000) -> Iterator[Tuple[int, Dict[str, Valor]]]:
+        """Percorre todas as sessões página a página, sem carregar tudo de uma vez."""
+        after_id = 0
+        while True:
+            page = self.fetch_page(after_id, page_size)
+            if not page:
+                return
+            yield from page
+            after_id = page[-1][0]
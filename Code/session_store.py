@@ -0,0 +1,264 @@
+# session_store.py
+"""
+Armazenamento colunar e tipado das sessões registradas pelo backend.
+Cada campo vira uma coluna própria em vez de um dicionário por sessão.
+"""
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Valor = Optional[Union[str, float, datetime, np.datetime64]]
+
+# Coluna tratada como carimbo de tempo (datetime64)
+TIMESTAMP_COLUMN = 'timestamp'
+
+
+class _CategoricalColumn:
+    """Coluna de strings internadas: códigos int32 + lista única de categorias."""
+
+    def __init__(self, capacity: int):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.categories: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def code_for(self, value: str) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self._lookup[value] = code
+        return code
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating))
+
+
+class SessionStore:
+    """
+    Armazena sessões em colunas tipadas:
+      - float64 para pressões, temperaturas e setup (NaN quando ausente);
+      - strings como categorias (session_name, horários, observações);
+      - datetime64 para o timestamp;
+      - object quando a mesma chave recebe números e strings (ex.: wing
+        5.0 e depois 'P6'): a coluna é promovida e guarda cada valor como
+        veio, sem conversão.
+    None em qualquer campo é tratado como ausente (NaN/código -1/None).
+    Os arrays crescem por duplicação de capacidade, então append é O(1)
+    amortizado. to_frame() devolve um DataFrame que referencia os arrays
+    internos sem cópia.
+
+    Cada sessão carrega uma revisão, atualizada a cada append/update, para
+    que caches derivados saibam exatamente quais sessões mudaram.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+        self._order: List[str] = []
+        self._floats: Dict[str, np.ndarray] = {}
+        self._strings: Dict[str, _CategoricalColumn] = {}
+        self._objects: Dict[str, np.ndarray] = {}
+        self._timestamps = np.full(self._capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        self._has_timestamp = False
+        self._revision = 0
+        self._revisions = np.zeros(self._capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> List[str]:
+        """Nomes das colunas na ordem em que apareceram."""
+        return list(self._order)
+
+    @property
+    def revision(self) -> int:
+        """Revisão mais recente atribuída a qualquer sessão."""
+        return self._revision
+
+    @property
+    def revisions(self) -> np.ndarray:
+        """Revisão de cada sessão (view somente leitura)."""
+        view = self._revisions[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        """Memória aproximada ocupada pelas colunas (capacidade reservada inclusa)."""
+        total = self._timestamps.nbytes if self._has_timestamp else 0
+        total += sum(arr.nbytes for arr in self._floats.values())
+        for col in self._strings.values():
+            total += col.codes.nbytes + sum(len(c) for c in col.categories)
+        total += sum(arr.nbytes for arr in self._objects.values())
+        return total
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, arr in self._floats.items():
+            new = np.full(capacity, np.nan)
+            new[:self._size] = arr[:self._size]
+            self._floats[name] = new
+        for col in self._strings.values():
+            codes = np.full(capacity, -1, dtype=np.int32)
+            codes[:self._size] = col.codes[:self._size]
+            col.codes = codes
+        for name, arr in self._objects.items():
+            new = np.full(capacity, None, dtype=object)
+            new[:self._size] = arr[:self._size]
+            self._objects[name] = new
+        stamps = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        stamps[:self._size] = self._timestamps[:self._size]
+        self._timestamps = stamps
+        revisions = np.zeros(capacity, dtype=np.int64)
+        revisions[:self._size] = self._revisions[:self._size]
+        self._revisions = revisions
+        self._capacity = capacity
+
+    def _promote(self, key: str) -> np.ndarray:
+        """Converte a coluna `key` (float ou string) para object, preservando os valores."""
+        arr = np.full(self._capacity, None, dtype=object)
+        if key in self._floats:
+            values = self._floats.pop(key)
+            for row in np.flatnonzero(~np.isnan(values)):
+                arr[row] = float(values[row])
+        else:
+            col = self._strings.pop(key)
+            for row in np.flatnonzero(col.codes >= 0):
+                arr[row] = col.categories[col.codes[row]]
+        self._objects[key] = arr
+        return arr
+
+    def _set(self, row: int, key: str, value: Valor) -> None:
+        if key == TIMESTAMP_COLUMN:
+            if not self._has_timestamp:
+                self._has_timestamp = True
+                self._order.append(key)
+            self._timestamps[row] = np.datetime64(value, 'us') if value is not None else np.datetime64('NaT')
+        elif key in self._objects:
+            self._objects[key][row] = value
+        elif value is None:
+            # ausente: não muda o tipo da coluna (coluna nova começa como float)
+            if key in self._strings:
+                self._strings[key].codes[row] = -1
+            else:
+                if key not in self._floats:
+                    self._floats[key] = np.full(self._capacity, np.nan)
+                    self._order.append(key)
+                self._floats[key][row] = np.nan
+        elif key in self._strings:
+            if isinstance(value, str):
+                col = self._strings[key]
+                col.codes[row] = col.code_for(value)
+            else:
+                self._promote(key)[row] = value
+        elif key in self._floats:
+            if _is_number(value):
+                self._floats[key][row] = float(value)
+            elif np.isnan(self._floats[key][:self._size]).all():
+                # só ausentes até aqui (ex.: None): a coluna vira string
+                del self._floats[key]
+                col = self._strings[key] = _CategoricalColumn(self._capacity)
+                col.codes[row] = col.code_for(str(value))
+            else:
+                self._promote(key)[row] = value
+        elif isinstance(value, str):
+            col = _CategoricalColumn(self._capacity)
+            col.codes[row] = col.code_for(value)
+            self._strings[key] = col
+            self._order.append(key)
+        elif _is_number(value):
+            arr = np.full(self._capacity, np.nan)
+            arr[row] = float(value)
+            self._floats[key] = arr
+            self._order.append(key)
+        else:
+            arr = np.full(self._capacity, None, dtype=object)
+            arr[row] = value
+            self._objects[key] = arr
+            self._order.append(key)
+
+    def append(self, record: Mapping[str, Valor]) -> int:
+        """
+        Adiciona uma sessão. Campos novos criam colunas novas, preenchidas
+        com NaN/ausente nas sessões anteriores.
+
+        Returns:
+            índice da sessão adicionada.
+        """
+        row = self._size
+        self._grow(row + 1)
+        for key, value in record.items():
+            self._set(row, key, value)
+        self._size += 1
+        self._touch(row)
+        return row
+
+    def update(self, row: int, fields: Mapping[str, Valor]) -> None:
+        """Altera campos de uma sessão existente e avança sua revisão."""
+        if not 0 <= row < self._size:
+            raise IndexError(f"Sessão {row} não existe.")
+        for key, value in fields.items():
+            self._set(row, key, value)
+        self._touch(row)
+
+    def _touch(self, row: int) -> None:
+        self._revision += 1
+        self._revisions[row] = self._revision
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame com uma linha por sessão. Colunas numéricas e o timestamp
+        são views dos arrays internos (sem cópia); strings viram Categorical.
+        Trate o resultado como somente leitura.
+        """
+        n = self._size
+        data = {}
+        for key in self._order:
+            if key == TIMESTAMP_COLUMN:
+                data[key] = self._timestamps[:n]
+            elif key in self._floats:
+                data[key] = self._floats[key][:n]
+            elif key in self._objects:
+                data[key] = self._objects[key][:n]
+            else:
+                col = self._strings[key]
+                data[key] = pd.Categorical.from_codes(col.codes[:n], categories=col.categories)
+        return pd.DataFrame(data, columns=self._order, copy=False)
+
+    def record(self, row: int) -> Dict[str, Valor]:
+        """Reconstrói a sessão `row` como dicionário (campos ausentes são omitidos)."""
+        if not 0 <= row < self._size:
+            raise IndexError(f"Sessão {row} não existe.")
+        rec: Dict[str, Valor] = {}
+        for key in self._order:
+            if key == TIMESTAMP_COLUMN:
+                stamp = self._timestamps[row]
+                if not np.isnat(stamp):
+                    rec[key] = stamp.astype(datetime).isoformat()
+            elif key in self._floats:
+                value = self._floats[key][row]
+                if not np.isnan(value):
+                    rec[key] = float(value)
+            elif key in self._objects:
+                value = self._objects[key][row]
+                if value is not None:
+                    rec[key] = value
+            else:
+                col = self._strings[key]
+                code = col.codes[row]
+                if code >= 0:
+                    rec[key] = col.categories[code]
+        return rec
+
+    def records(self) -> Iterator[Dict[str, Valor]]:
+        """Itera as sessões como dicionários, na ordem de inserção."""
+        for row in range(self._size):
+            yield self.record(row)
@@ -0,0 +1,6 @@
+# conftest.py
+"""Os módulos do app ficam em Code/ (layout plano); os testes os importam direto."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,80 @@
+# test_export_worker.py
+"""Gravação atômica, cancelamento e fallback do ReportExportWorker."""
+import pandas as pd
+import pytest
+
+pytest.importorskip('PySide6')
+
+import report_io
+from export_worker import ReportExportWorker
+from session_db import SessionDatabase
+
+ROWS = [{'session_name': f'S{i}', 'cold_FL': 25.0 + i} for i in range(20)]
+COLUMNS = ['session_name', 'cold_FL']
+
+
+def _read(path):
+    if path.suffix == '.xlsx':
+        return pd.read_excel(path)
+    if path.suffix == '.csv':
+        return pd.read_csv(path, sep=';', decimal=',', encoding='utf-8-sig')
+    return report_io.load_report(path)
+
+
+def _run(worker):
+    events = []
+    worker.signals.finished.connect(lambda path, warning: events.append(('finished', path, warning)))
+    worker.signals.failed.connect(lambda message: events.append(('failed', message)))
+    worker.signals.cancelled.connect(lambda: events.append(('cancelled',)))
+    worker.run()
+    return events
+
+
+@pytest.mark.parametrize('name', ['r.xlsx', 'r.csv', 'r.feather'])
+def test_cancel_keeps_existing_file(tmp_path, name):
+    target = tmp_path / name
+    target.write_bytes(b'previous report')
+    worker = ReportExportWorker(ROWS, COLUMNS, str(target), chunk_size=5)
+    worker.cancel()
+    assert _run(worker) == [('cancelled',)]
+    assert target.read_bytes() == b'previous report'
+    assert [p.name for p in tmp_path.iterdir()] == [name]
+
+
+@pytest.mark.parametrize('name', ['r.xlsx', 'r.csv', 'r.parquet'])
+def test_export_replaces_target(tmp_path, name):
+    target = tmp_path / name
+    target.write_bytes(b'previous report')
+    events = _run(ReportExportWorker(ROWS, COLUMNS, str(target), chunk_size=5))
+    assert events == [('finished', str(target), '')]
+    assert list(_read(target)['session_name']) == [r['session_name'] for r in ROWS]
+    assert [p.name for p in tmp_path.iterdir()] == [name]
+
+
+def test_fallback_names_the_format(tmp_path, monkeypatch):
+    def broken(df, path):
+        raise OSError('no pyarrow')
+    monkeypatch.setattr(report_io, 'export_columnar', broken)
+    target = tmp_path / 'r.parquet'
+    events = _run(ReportExportWorker(ROWS, COLUMNS, str(target)))
+    csv_path = str(tmp_path / 'r.csv')
+    assert events == [('finished', csv_path,
+                       f"Could not save as Parquet (error: no pyarrow). Saved as CSV: {csv_path}")]
+    assert [p.name for p in tmp_path.iterdir()] == ['r.csv']
+
+
+def test_from_database_exports_full_history(tmp_path):
+    db_path = tmp_path / 's.db'
+    with SessionDatabase(db_path) as db:
+        db.insert_many(ROWS)
+        db.insert_many([{'session_name': 'empty', 'cold_FL': None}])
+    target = tmp_path / 'r.csv'
+    worker = ReportExportWorker.from_database(db_path, ['session_name', 'wing', 'cold_FL'],
+                                              str(target), chunk_size=3)
+    progress = []
+    worker.signals.progress.connect(lambda written, total: progress.append((written, total)))
+    assert _run(worker) == [('finished', str(target), '')]
+    df = _read(target)
+    assert list(df.columns) == COLUMNS
+    assert list(df['session_name']) == [r['session_name'] for r in ROWS] + ['empty']
+    assert progress[-1] == (21, 21)
@@ -0,0 +1,134 @@
+# test_pressure_kernel.py
+"""
+Kernel de correção (escalar, vetorizado e em floats) contra as expressões
+originais da GUI, e backend.calculate contra calculate_batch.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pressure_kernel
+from backend import INPUT_COLUMNS, TIRES, TirePressureBackend, _round2
+
+
+def _reference_scalar(tgt, cold, hot, air1, air2, track1, track2):
+    """Fórmula escalar original (GUI), mantida como referência."""
+    air1K = air1 + 273.15; air2K = air2 + 273.15
+    track1K = track1 + 273.15; track2K = track2 + 273.15
+    new_cold = cold * tgt / hot if hot else 0
+    corr_air = new_cold * air2K / air1K if air1K else 0
+    new_cold_b = new_cold / 14.504
+    corr_track = (((new_cold_b+1)*air2K)/((air2K*(new_cold_b+1)/(new_cold_b+1))+(track2K-track1K))-1)*14.504 if track1K else 0
+    return new_cold, corr_air, corr_track
+
+
+def _random_inputs(n, seed=0):
+    """Sessões sintéticas com valores plausíveis de pista (e alguns hot == 0)."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for t in TIRES:
+        data[f"target_{t}"] = rng.uniform(20.0, 32.0, n).round(1)
+        data[f"cold_{t}"] = rng.uniform(18.0, 30.0, n).round(1)
+        hot = rng.uniform(24.0, 38.0, n).round(1)
+        hot[rng.random(n) < 0.02] = 0.0
+        data[f"hot_{t}"] = hot
+    for key in ('air1', 'air2'):
+        data[key] = rng.uniform(-5.0, 45.0, n).round(1)
+    for key in ('track1', 'track2'):
+        data[key] = rng.uniform(0.0, 65.0, n).round(1)
+    return data
+
+
+def _tire_args(data, t):
+    return [data[f"{p}_{t}"] for p in ('target', 'cold', 'hot')] + \
+        [data[k] for k in ('air1', 'air2', 'track1', 'track2')]
+
+
+def test_kernel_matches_reference():
+    data = _random_inputs(2000)
+    for t in TIRES:
+        args = _tire_args(data, t)
+        vec = pressure_kernel.corrected_pressures(*args)
+        for i in range(len(args[0])):
+            row = [float(a[i]) for a in args]
+            ref = _reference_scalar(*row)
+            np.testing.assert_allclose(pressure_kernel.corrected_pressures(*row), ref,
+                                       rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose([v[i] for v in vec], ref, rtol=1e-9, atol=1e-12)
+
+
+def test_float_path_identical_to_numpy():
+    data = _random_inputs(2000, seed=1)
+    rows = [[float(a[i]) for a in _tire_args(data, t)] for t in TIRES for i in range(2000)]
+    # hot não medida, entradas ausentes/infinitas e divisões por zero
+    rows += [
+        [28.0, 25.0, 0.0, 20.0, 25.0, 30.0, 30.0],
+        [28.0, 25.0, math.nan, 20.0, 25.0, 30.0, 35.0],
+        [28.0, 25.0, 32.0, math.inf, 25.0, 30.0, 35.0],
+        [28.0, 25.0, 32.0, -273.15, 25.0, 30.0, 35.0],
+        [28.0, 25.0, 32.0, 20.0, 25.0, -273.15, 35.0],
+        [28.0, 25.0, 32.0, 20.0, -273.15, 30.0, 30.0],
+        [28.0, 25.0, 32.0, 20.0, 25.0, 30.0, -268.15],
+    ]
+    for row in rows:
+        expected = [float(v) for v in pressure_kernel.corrected_pressures(*row)]
+        got = pressure_kernel.corrected_pressures_float(*row)
+        assert all(type(v) is float for v in got)
+        np.testing.assert_array_equal(got, expected, err_msg=str(row))
+
+
+def test_round2_matches_np_round():
+    rng = np.random.default_rng(2)
+    values = np.concatenate([
+        rng.uniform(-50.0, 50.0, 20000),
+        np.arange(-2000, 2000) / 1000 + 0.0005,    # metades (x.xx5)
+        [0.0, -0.0, 0.005, 0.015, 2.675, 1e300, -1e307, np.inf, -np.inf, np.nan],
+    ])
+    with np.errstate(over='ignore'):
+        expected = np.round(values, 2)
+    np.testing.assert_array_equal([_round2(float(v)) for v in values], expected)
+
+
+def test_calculate_matches_calculate_batch():
+    n = 2000
+    data = _random_inputs(n)
+    backend = TirePressureBackend()
+    batch = backend.calculate_batch(data)
+    for t in TIRES:
+        ref = [_reference_scalar(*[float(a[i]) for a in _tire_args(data, t)]) for i in range(n)]
+        for k, name in enumerate(('new_cold', 'corr_air', 'corr_track')):
+            np.testing.assert_allclose(batch[f"{name}_{t}"], [r[k] for r in ref],
+                                       rtol=0, atol=0.005 + 1e-9)
+    for i in range(n):
+        single = backend.calculate({k: float(data[k][i]) for k in INPUT_COLUMNS})
+        assert single == batch.iloc[i].to_dict(), f"sessão {i}"
+
+
+def test_batch_missing_keys_match_calculate():
+    n, seed = 500, 3
+    data = _random_inputs(n, seed)
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(n):
+        keep = rng.random(len(INPUT_COLUMNS)) > 0.3
+        records.append({k: float(data[k][i]) for k, ok in zip(INPUT_COLUMNS, keep) if ok})
+    # uma sessão só com cold_FL e uma chave ausente do lote inteiro
+    records[0] = {'cold_FL': 25.0}
+    for rec in records:
+        rec.pop('hot_RR', None)
+    backend = TirePressureBackend()
+    batch = backend.calculate_batch(pd.DataFrame(records))
+    for i, rec in enumerate(records):
+        assert batch.iloc[i].to_dict() == backend.calculate(rec), f"sessão {i} ({sorted(rec)})"
+
+
+@pytest.mark.parametrize('hot', [0.0, 0])
+def test_unmeasured_hot_keeps_track_term(hot):
+    result = TirePressureBackend().calculate({'target_FL': 28.0, 'cold_FL': 25.0, 'hot_FL': hot,
+                                              'air1': 20.0, 'air2': 25.0,
+                                              'track1': 30.0, 'track2': 40.0})
+    assert result['new_cold_FL'] == 0.0 and result['corr_air_FL'] == 0.0
+    assert result['corr_track_FL'] == _round2(_reference_scalar(28.0, 25.0, hot, 20.0, 25.0, 30.0, 40.0)[2])
+    assert result['corr_track_FL'] != 0.0
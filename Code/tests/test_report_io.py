@@ -0,0 +1,24 @@
+# test_report_io.py
+"""Escrita de relatórios em blocos (report_io)."""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import report_io
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def test_excel_datetime_columns_from_generator(tmp_path):
+    df = pd.DataFrame({'session_name': ['A', 'B'],
+                       'start': [datetime(2024, 5, 1, 10, 0), datetime(2024, 5, 1, 11, 30)],
+                       'end': [datetime(2024, 5, 1, 10, 45), None]})
+    path = tmp_path / 'r.xlsx'
+    # um gerador só pode ser percorrido uma vez; as duas colunas precisam do formato
+    report_io.write_excel_chunks([df], path, list(df.columns),
+                                 datetime_columns=(c for c in ('start', 'end')))
+    ws = openpyxl.load_workbook(path).active
+    assert ws['B2'].number_format == report_io.EXCEL_DATETIME_FORMAT
+    assert ws['C2'].number_format == report_io.EXCEL_DATETIME_FORMAT
+    assert ws['C3'].value is None
@@ -0,0 +1,58 @@
+# test_rigidez_backend.py
+"""Buscas de rigidez (por canto e de alta resolução) contra força bruta."""
+import itertools
+
+import numpy as np
+import pytest
+
+import rigidez_backend
+from arb_tables import ArbTable
+from rigidez_backend import find_setups_per_corner, get_distribution
+
+
+def _table_01() -> ArbTable:
+    # passo de 0.1: médias como 0.30000000000000004 caem logo após a posição
+    pos = [round(0.1 * i, 1) for i in range(1, 8)]
+    front = [(p, 100.0 + 40.0 * p) for p in pos]
+    rear = [(p, 90.0 + 55.0 * p) for p in pos]
+    return ArbTable('passo_01', front, rear)
+
+
+def _brute_force(table: ArbTable, target: float, tol: float):
+    """Todas as combinações por canto que get_distribution aceita no modo strict."""
+    pos = [p for p, _ in table.front]
+    found = set()
+    for fl, fr, rl, rr in itertools.product(pos, repeat=4):
+        try:
+            pct = get_distribution([fl, fr], [rl, rr], 'strict', table)
+        except ValueError:
+            continue
+        if abs(pct - target) <= tol:
+            found.add((fl, fr, rl, rr))
+    return found
+
+
+@pytest.mark.parametrize('target, tol', [(50.0, 100.0), (45.0, 1.0)])
+def test_per_corner_strict_matches_brute_force(target, tol):
+    table = _table_01()
+    expected = _brute_force(table, target, tol)
+    result = find_setups_per_corner(target, tol, table=table)
+    assert len(result) == len(expected)
+    assert {row[:4] for row in result} == expected
+
+
+def test_highres_matches_full_matrix():
+    g = rigidez_backend._highres_grid(rigidez_backend._resolve(None), 0.02, 'pchip')
+    pct = g.vf[:, None] / (g.vf[:, None] + g.vr[None, :]) * 100
+    for target in (15.0, 33.3, 40.0, 62.5):
+        for tol in (0.01, 0.5, 5.0):
+            dev = np.abs(pct - target)
+            fi, k = np.nonzero(dev <= tol)
+            ranked = np.lexsort((g.rear_rank[k], fi, dev[fi, k]))
+            for limit in (1, 25, 200):
+                got = rigidez_backend.find_setups_highres(target, tol, limit, 0.02)
+                sel = ranked[:limit]
+                ref = list(zip(g.front[fi[sel]].tolist(), g.rear[k[sel]].tolist(),
+                               pct[fi[sel], k[sel]].tolist()))
+                assert got.total == len(fi), f"{target} ± {tol}"
+                assert got.setups == ref, f"{target} ± {tol}, limit {limit}"
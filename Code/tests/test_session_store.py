@@ -0,0 +1,69 @@
+# test_session_store.py
+"""Tipos mistos e valores ausentes no SessionStore (e via backend.new_session)."""
+import math
+import os
+
+import pandas as pd
+
+from backend import TirePressureBackend
+from session_store import SessionStore
+
+
+def _new_session(backend, **setup):
+    backend.new_session({'session_name': 'S'}, {'cold_FL': 25.0}, {'air1': 20.0}, setup)
+
+
+def test_float_column_promoted_by_string():
+    backend = TirePressureBackend()
+    _new_session(backend, wing=5.0)
+    _new_session(backend, wing='P6')
+    assert [rec['wing'] for rec in backend.get_sessions()] == [5.0, 'P6']
+    assert list(backend.get_sessions_frame()['wing']) == [5.0, 'P6']
+
+
+def test_none_is_missing():
+    backend = TirePressureBackend()
+    _new_session(backend, wing=5.0)
+    _new_session(backend, wing=None)
+    sessions = backend.get_sessions()
+    assert sessions[0]['wing'] == 5.0
+    assert 'wing' not in sessions[1]
+    assert math.isnan(backend.get_sessions_frame()['wing'].iloc[1])
+
+
+def test_string_column_keeps_numbers_as_numbers():
+    store = SessionStore()
+    store.append({'driver': 'A'})
+    store.append({'driver': 5.0})
+    store.append({'driver': None})
+    assert [store.record(i).get('driver') for i in range(3)] == ['A', 5.0, None]
+    frame = store.to_frame()
+    assert frame['driver'].iloc[1] == 5.0 and not isinstance(frame['driver'].iloc[1], str)
+    assert pd.isna(frame['driver'].iloc[2])
+
+
+def test_missing_then_string_stays_categorical():
+    store = SessionStore()
+    store.append({'obs': None})
+    store.append({'obs': 'chuva'})
+    assert [store.record(i).get('obs') for i in range(2)] == [None, 'chuva']
+    assert isinstance(store.to_frame()['obs'].dtype, pd.CategoricalDtype)
+
+
+def test_promoted_column_survives_growth_and_update():
+    store = SessionStore(capacity=2)
+    for i in range(5):
+        store.append({'wing': float(i)})
+    store.append({'wing': 'P6'})
+    store.update(0, {'wing': 'P4'})
+    assert [store.record(i)['wing'] for i in range(6)] == ['P4', 1.0, 2.0, 3.0, 4.0, 'P6']
+
+
+def test_mixed_types_export(tmp_path):
+    backend = TirePressureBackend()
+    _new_session(backend, wing=5.0)
+    _new_session(backend, wing='P6')
+    out = tmp_path / 'r.csv'
+    backend.export_report(str(out))
+    assert list(pd.read_csv(out)['wing'].astype(str)) == ['5.0', 'P6']
+    assert os.path.getsize(out) > 0
@@ -1,19 +1,26 @@
 import sys
-import pandas as pd
+from functools import lru_cache
+import numpy as np
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QGroupBox, QLabel, QGridLayout,
     QDoubleSpinBox, QPushButton, QTimeEdit, QLineEdit, QSizePolicy, QMessageBox, QFileDialog, QTabWidget, QTextEdit,
-    QScrollArea, QDialog, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+    QScrollArea, QDialog, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox,
+    QProgressDialog
 )
-from PySide6.QtCore import Qt, QTime, QTimer
-from PySide6.QtGui import QColor, QPixmap, QIcon
+from PySide6.QtCore import Qt, QTime, QTimer, QThreadPool
+from PySide6.QtGui import QColor, QFont, QPixmap, QIcon
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT
 import os
-import mplcursors
+import sqlite3
+from datetime import datetime
 import rigidez_backend
-from openpyxl.utils import get_column_letter
+import arb_tables
+import instrumentation
+import pressure_kernel
+from chart_model import IncrementalChart, SessionSeries
+from session_db import SessionDatabase
 
 # Estilo personalizado para a caixa de diálogo de configuração do matplotlib
 MATPLOTLIB_DIALOG_STYLE = """
@@ -71,6 +78,182 @@ QGroupBox::title {
 }
 """
 
+# Banco local com o histórico de sessões da GUI
+SESSION_DB_PATH = os.path.join(os.path.expanduser('~'), '.tire_pressure_app', 'sessions.db')
+
+# Sessões do histórico carregadas na abertura (as mais recentes); o restante
+# é lido do banco quando a exportação precisa do histórico completo
+HISTORY_PAGE_SIZE = 500
+
+# Linhas de resultado da busca de setups carregadas por vez na aba ARB SETUP
+SETUP_PAGE_SIZE = 50
+
+# Ordem das colunas no relatório exportado pela GUI
+REPORT_COLUMNS = [
+    'session_name', 'start_time', 'end_time',
+    # Pressões alvo
+    'Target Pressures (psi)_FL', 'Target Pressures (psi)_FR',
+    'Target Pressures (psi)_RL', 'Target Pressures (psi)_RR',
+    # Pressões frias
+    'Cold Pressures (psi)_FL', 'Cold Pressures (psi)_FR',
+    'Cold Pressures (psi)_RL', 'Cold Pressures (psi)_RR',
+    # Pressões quentes
+    'Hot Pressures (psi)_FL', 'Hot Pressures (psi)_FR',
+    'Hot Pressures (psi)_RL', 'Hot Pressures (psi)_RR',
+    # Temperaturas
+    'air1', 'air2', 'track1', 'track2',
+    # Car Setup
+    'arb_fl', 'arb_fr', 'arb_rl', 'arb_rr', 'wing',
+    # Resultados calculados
+    'Corrected Cold Pressure_FL', 'Corrected Cold Pressure_FR',
+    'Corrected Cold Pressure_RL', 'Corrected Cold Pressure_RR',
+    'Cold pr. corrected by air temp_FL', 'Cold pr. corrected by air temp_FR',
+    'Cold pr. corrected by air temp_RL', 'Cold pr. corrected by air temp_RR',
+    'Cold pr. corrected by Track Temp_FL', 'Cold pr. corrected by Track Temp_FR',
+    'Cold pr. corrected by Track Temp_RL', 'Cold pr. corrected by Track Temp_RR',
+    # Observações
+    'observacoes'
+]
+
+# Redimensionamento: eventos agrupados por RESIZE_DEBOUNCE_MS; a escala da
+# interface é arredondada para um destes degraus (fontes em cache)
+RESIZE_DEBOUNCE_MS = 120
+SCALE_BUCKETS = (0.7, 0.8, 0.9, 1.0)
+# Fundos pré-escalados mantidos (tamanhos de janela recentes)
+BG_CACHE_SIZE = 4
+
+
+# Folha de estilo da janela, aplicada uma vez. Os tamanhos de fonte dependem
+# do degrau de escala e vão como QFont em cada widget (_apply_fonts), sem
+# reprocessar a folha inteira a cada mudança de degrau
+WINDOW_STYLESHEET = """
+    QMainWindow, QWidget {
+        font-family: 'Porsche', 'Montserrat', sans-serif;
+        color: #FFFFFF;
+        background-color: transparent;
+        font-weight: bold;
+    }
+    QScrollArea {
+        background: transparent;
+        border: none;
+    }
+    QScrollBar:vertical {
+        border: none;
+        background: rgba(0, 0, 0, 0.2);
+        width: 10px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background: #D40000;
+        min-height: 20px;
+        border-radius: 5px;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QScrollBar:horizontal {
+        border: none;
+        background: rgba(0, 0, 0, 0.2);
+        height: 10px;
+        margin: 0px;
+    }
+    QScrollBar::handle:horizontal {
+        background: #D40000;
+        min-width: 20px;
+        border-radius: 5px;
+    }
+    QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+        width: 0px;
+    }
+    QGroupBox {
+        color: #FFFFFF;
+        font-family: 'Porsche';
+        border: 2px solid #D40000;
+        border-radius: 8px;
+        margin: 10px;
+        padding: 18px 12px;
+        background: rgba(0, 0, 0, 0.85);
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        background: #D40000;
+        padding: 4px 12px;
+        margin-top: 12px;
+        color: #FFFFFF;
+        border-radius: 4px;
+    }
+    QLabel {
+        font-family: 'Porsche';
+        color: #FFFFFF;
+    }
+    QDoubleSpinBox, QLineEdit, QTimeEdit {
+        background: rgba(255, 255, 255, 0.1);
+        color: #FFFFFF;
+        border: 1px solid #D40000;
+        border-radius: 4px;
+        padding: 6px;
+        font-family: 'Porsche';
+        min-width: 60px;
+    }
+    QDoubleSpinBox:focus, QLineEdit:focus, QTimeEdit:focus {
+        border: 2px solid #D40000;
+        background: rgba(212, 0, 0, 0.1);
+    }
+    QPushButton {
+        background: #D40000;
+        color: #FFFFFF;
+        border-radius: 4px;
+        padding: 12px 24px;
+        font-family: 'Porsche';
+        text-transform: uppercase;
+        min-width: 100px;
+    }
+    QPushButton:hover {
+        background: #FF4C4C;
+        border: 1px solid #FFFFFF;
+    }
+    QPushButton:pressed {
+        background: #A80000;
+    }
+    QTabWidget::pane {
+        border: 2px solid #D40000;
+        background: transparent;
+    }
+    QTabBar::tab {
+        background: #1A1A1A;
+        color: #FFFFFF;
+        padding: 8px 16px;
+        border: 1px solid #D40000;
+        border-bottom: none;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        min-width: 100px;
+    }
+    QTabBar::tab:selected {
+        background: #D40000;
+        color: #FFFFFF;
+    }
+    QTabBar::tab:hover:!selected {
+        background: #2A2A2A;
+    }
+"""
+
+
+@lru_cache(maxsize=None)
+def scaled_font(pixel_size: int) -> QFont:
+    """Fonte de um degrau de escala; família e peso vêm de WINDOW_STYLESHEET."""
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    return font
+
+
+def scale_bucket(width: int) -> float:
+    """Degrau de SCALE_BUCKETS para a largura da janela (referência 1920 px)."""
+    scale = min(max(width / 1920, SCALE_BUCKETS[0]), SCALE_BUCKETS[-1])
+    return max(b for b in SCALE_BUCKETS if b <= scale + 1e-9)
+
+
 class CustomNavigationToolbar(NavigationToolbar2QT):
     def __init__(self, canvas, parent=None):
         super().__init__(canvas, parent)
@@ -158,142 +341,56 @@ class CustomNavigationToolbar(NavigationToolbar2QT):
         return result
 
 class TirePressureApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, lazy_tabs=True):
         super().__init__()
         self.setWindowTitle("Tire Management System")
         self.setMinimumSize(1366, 768)
-        self.sessions_data = []
+        # Histórico persistido entre execuções (em memória se o banco não abrir)
+        try:
+            self.session_db = SessionDatabase(SESSION_DB_PATH)
+            # Só as sessões mais recentes; o relatório lê o histórico completo do banco
+            page = self.session_db.fetch_last(HISTORY_PAGE_SIZE)
+            self.sessions_data = [rec for _, rec in page]
+        except (sqlite3.Error, OSError):
+            self.session_db = None
+            self.sessions_data = []
+        # Exportação em andamento (uma por vez, em segundo plano)
+        self._export_worker = None
+        self._export_progress = None
         self.base_font_size = 14
         self.base_groupbox_font_size = 16
         self.base_spacing = 12
+        # Fontes por degrau de escala, aplicadas após o fim do redimensionamento
+        self._scale_bucket = None
+        self._fonts = None
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self._resize_timer.timeout.connect(self._apply_scale)
+        self._bg_cache = {}
 
         # Inicialização do gráfico principal
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
+        # Séries compartilhadas pelos gráficos de sessão
+        self.chart_series = SessionSeries()
+        self.chart = IncrementalChart(self.ax, self.chart_series)
+        # Tela cheia do gráfico, montada na primeira abertura
+        self._fullscreen_dialog = None
+        self._fullscreen_chart = None
 
         # Estilos
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                font-family: 'Porsche', 'Montserrat', sans-serif;
-                color: #FFFFFF;
-                background-color: transparent;
-                font-weight: bold;
-            }
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: rgba(0, 0, 0, 0.2);
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #D40000;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar:horizontal {
-                border: none;
-                background: rgba(0, 0, 0, 0.2);
-                height: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:horizontal {
-                background: #D40000;
-                min-width: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                width: 0px;
-            }
-            QGroupBox {
-                color: #FFFFFF;
-                font: bold 16px 'Porsche';
-                border: 2px solid #D40000;
-                border-radius: 8px;
-                margin: 10px;
-                padding: 18px 12px;
-                background: rgba(0, 0, 0, 0.85);
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                background: #D40000;
-                padding: 4px 12px;
-                margin-top: 12px;
-                font: bold 16px 'Porsche';
-                color: #FFFFFF;
-                border-radius: 4px;
-            }
-            QLabel {
-                font: bold 14px 'Porsche';
-                color: #FFFFFF;
-            }
-            QDoubleSpinBox, QLineEdit, QTimeEdit {
-                background: rgba(255, 255, 255, 0.1);
-                color: #FFFFFF;
-                border: 1px solid #D40000;
-                border-radius: 4px;
-                padding: 6px;
-                font: bold 14px 'Porsche';
-                min-width: 60px;
-            }
-            QDoubleSpinBox:focus, QLineEdit:focus, QTimeEdit:focus {
-                border: 2px solid #D40000;
-                background: rgba(212, 0, 0, 0.1);
-            }
-            QPushButton {
-                background: #D40000;
-                color: #FFFFFF;
-                border-radius: 4px;
-                padding: 12px 24px;
-                font: bold 14px 'Porsche';
-                text-transform: uppercase;
-                min-width: 120px;
-            }
-            QPushButton:hover { 
-                background: #FF4C4C;
-                border: 1px solid #FFFFFF;
-            }
-            QPushButton:pressed {
-                background: #A80000;
-            }
-            QTabWidget::pane {
-                border: 2px solid #D40000;
-                background: transparent;
-            }
-            QTabBar::tab {
-                background: #1A1A1A;
-                color: #FFFFFF;
-                padding: 8px 16px;
-                border: 1px solid #D40000;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                min-width: 120px;
-            }
-            QTabBar::tab:selected {
-                background: #D40000;
-                color: #FFFFFF;
-            }
-            QTabBar::tab:hover:!selected {
-                background: #2A2A2A;
-            }
-        """)
+        self.setStyleSheet(WINDOW_STYLESHEET)
 
         # Fundo com imagem
         bg_path = os.path.join(os.path.dirname(__file__), 'assets', 'images', 'background ff.png')
         self.bg_label = None
         if os.path.exists(bg_path):
             self.bg_label = QLabel(self)
-            pixmap = QPixmap(bg_path)
-            self.bg_label.setPixmap(pixmap)
+            # Original em resolução cheia; o label recebe cópias pré-escaladas
+            self._bg_source = QPixmap(bg_path)
+            self.bg_label.setPixmap(self._bg_source)
             self.bg_label.setScaledContents(True)
             self.bg_label.lower()
             self.bg_label.setGeometry(0, 0, self.width(), self.height())
@@ -327,111 +424,88 @@ class TirePressureApp(QMainWindow):
         self.tab_rigidez_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.tab_rigidez_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.tabs.addTab(self.tab_rigidez_scroll, "ARB SETUP")
-        self.build_rigidez_tab(self.tab_rigidez)
+        # Com lazy_tabs, a aba (heatmap, mapa da asa, imagens) é montada na primeira ativação
+        self._rigidez_built = False
+        if lazy_tabs:
+            self.tabs.currentChanged.connect(self._ensure_rigidez_tab)
+        else:
+            self._ensure_rigidez_tab()
         
         self.resizeEvent = self._resize_bg_and_fonts
+        if self.sessions_data:
+            self.update_chart()
 
+    def _ensure_rigidez_tab(self, index=None):
+        """Monta a aba ARB SETUP se ainda não foi montada (index: aba ativada)."""
+        if self._rigidez_built or (index is not None and
+                                   self.tabs.widget(index) is not self.tab_rigidez_scroll):
+            return
+        self._rigidez_built = True
+        self.build_rigidez_tab(self.tab_rigidez)
+        self._apply_fonts(self.tab_rigidez)
+
+    @instrumentation.instrument()
     def _resize_bg_and_fonts(self, event):
-        # Ajusta imagem de fundo
+        # O fundo acompanha a janela na hora, esticando o pixmap já reduzido;
+        # fontes e o fundo no tamanho exato esperam o fim do arraste
         if self.bg_label:
             self.bg_label.setGeometry(0, 0, self.width(), self.height())
-        # Ajuste dinâmico de fonte e espaçamento
-        w = self.width()
-        h = self.height()
-        # Fator de escala baseado na largura (pode ajustar para ser mais ou menos sensível)
-        scale = min(max(w / 1920, 0.7), 1.0)
-        font_size = int(self.base_font_size * scale)
-        groupbox_font_size = int(self.base_groupbox_font_size * scale)
-        spacing = int(self.base_spacing * scale)
-        # Ajusta fonte global
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                font-family: 'Porsche', 'Montserrat', sans-serif;
-                color: #FFFFFF;
-                background-color: transparent;
-                font-weight: bold;
-                font-size: {font_size}px;
-            }}
-            QGroupBox {{
-                color: #FFFFFF;
-                font: bold {groupbox_font_size}px 'Porsche';
-                border: 2px solid #D40000;
-                border-radius: 8px;
-                margin: 10px;
-                padding: 18px 12px;
-                background: rgba(0, 0, 0, 0.85);
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                background: #D40000;
-                padding: 4px 12px;
-                margin-top: 12px;
-                font: bold {groupbox_font_size}px 'Porsche';
-                color: #FFFFFF;
-                border-radius: 4px;
-            }}
-            QLabel {{
-                font: bold {font_size}px 'Porsche';
-                color: #FFFFFF;
-            }}
-            QDoubleSpinBox, QLineEdit, QTimeEdit {{
-                background: rgba(255, 255, 255, 0.1);
-                color: #FFFFFF;
-                border: 1px solid #D40000;
-                border-radius: 4px;
-                padding: 6px;
-                font: bold {font_size}px 'Porsche';
-                min-width: 60px;
-            }}
-            QDoubleSpinBox:focus, QLineEdit:focus, QTimeEdit:focus {{
-                border: 2px solid #D40000;
-                background: rgba(212, 0, 0, 0.1);
-            }}
-            QPushButton {{
-                background: #D40000;
-                color: #FFFFFF;
-                border-radius: 4px;
-                padding: 12px 24px;
-                font: bold {font_size}px 'Porsche';
-                text-transform: uppercase;
-                min-width: 100px;
-            }}
-            QPushButton:hover {{ 
-                background: #FF4C4C;
-                border: 1px solid #FFFFFF;
-            }}
-            QPushButton:pressed {{
-                background: #A80000;
-            }}
-            QTabWidget::pane {{
-                border: 2px solid #D40000;
-                background: transparent;
-            }}
-            QTabBar::tab {{
-                background: #1A1A1A;
-                color: #FFFFFF;
-                padding: 8px 16px;
-                border: 1px solid #D40000;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                min-width: 100px;
-                font-size: {font_size}px;
-            }}
-            QTabBar::tab:selected {{
-                background: #D40000;
-                color: #FFFFFF;
-            }}
-            QTabBar::tab:hover:!selected {{
-                background: #2A2A2A;
-            }}
-        """)
+        if self._scale_bucket is None:
+            self._apply_scale()
+        else:
+            self._resize_timer.start()
+        QWidget.resizeEvent(self, event)
+
+    @instrumentation.instrument()
+    def _apply_scale(self):
+        """Fundo pré-escalado para o tamanho atual e fontes do degrau de escala."""
+        self._update_background()
+        bucket = scale_bucket(self.width())
+        if bucket == self._scale_bucket:
+            # Mesmo degrau: nenhuma métrica muda, nada é re-estilizado
+            return
+        self._scale_bucket = bucket
+        self._fonts = (scaled_font(int(self.base_font_size * bucket)),
+                       scaled_font(int(self.base_groupbox_font_size * bucket)))
+        # Diálogos e widgets criados depois já nascem com a fonte do degrau
+        QApplication.setFont(self._fonts[0])
+        self._apply_fonts(self)
         # Ajusta espaçamento dos layouts principais
+        spacing = int(self.base_spacing * bucket)
         for layout in [self.central_layout]:
             layout.setSpacing(spacing)
-        QWidget.resizeEvent(self, event)
 
+    def _apply_fonts(self, root):
+        """
+        Fontes do degrau atual em `root` e seus descendentes (títulos de
+        QGroupBox maiores). Com folha de estilo, a fonte de um widget não
+        passa para os filhos, então cada um recebe a sua; tamanhos fixados
+        na folha de estilo do próprio widget continuam valendo.
+        """
+        if self._fonts is None:
+            return
+        font, groupbox_font = self._fonts
+        for widget in [root] + root.findChildren(QWidget):
+            # listas dos QComboBox seguem a folha de estilo do próprio combo
+            if widget.window().windowType() == Qt.Popup:
+                continue
+            widget.setFont(groupbox_font if isinstance(widget, QGroupBox) else font)
+
+    def _update_background(self):
+        if not self.bg_label:
+            return
+        key = (self.width(), self.height())
+        pixmap = self._bg_cache.pop(key, None)
+        if pixmap is None:
+            pixmap = self._bg_source.scaled(self.size(), Qt.IgnoreAspectRatio,
+                                            Qt.SmoothTransformation)
+            if len(self._bg_cache) >= BG_CACHE_SIZE:
+                self._bg_cache.pop(next(iter(self._bg_cache)))
+        # Reinserido no fim: o dicionário fica em ordem de uso
+        self._bg_cache[key] = pixmap
+        self.bg_label.setPixmap(pixmap)
+
+    @instrumentation.instrument()
     def build_data_tab(self, parent):
         root = QHBoxLayout(parent)
         root.setContentsMargins(12, 12, 12, 12)
@@ -451,6 +525,7 @@ class TirePressureApp(QMainWindow):
         grid.setContentsMargins(0, 0, 0, 0)
         # Pressures
         self.spinboxes = {}
+        self.calc_results = {}
         grp1, spins1 = self._make_pressure_group("Target Pressures (psi)", "Pressão alvo recomendada para o pneu")
         grp2, spins2 = self._make_pressure_group("Cold Pressures (psi)", "Pressão fria medida para o pneu")
         grp3, spins3 = self._make_pressure_group("Hot Pressures (psi)", "Pressão quente medida para o pneu")
@@ -615,6 +690,7 @@ class TirePressureApp(QMainWindow):
         self.mini_figure = Figure()
         self.mini_canvas = FigureCanvas(self.mini_figure)
         self.mini_ax = self.mini_figure.add_subplot(111)
+        self.mini_chart = IncrementalChart(self.mini_ax, self.chart_series, legend_fontsize=6)
         
         # Toolbar e botão fullscreen em layout horizontal
         toolbar_layout = QHBoxLayout()
@@ -754,18 +830,18 @@ class TirePressureApp(QMainWindow):
     def calculate(self):
         phases = ["Target Pressures (psi)", "Cold Pressures (psi)", "Hot Pressures (psi)"]
         tires = ['FL','FR','RL','RR']
-        vals = {ph: {t: self.spinboxes[ph][t].value() for t in tires} for ph in phases}
-        air1K = self.air1.value() + 273.15; air2K = self.air2.value() + 273.15
-        track1K = self.track1.value() + 273.15; track2K = self.track2.value() + 273.15
-        for t in tires:
-            tgt, cold, hot = vals['Target Pressures (psi)'][t], vals['Cold Pressures (psi)'][t], vals['Hot Pressures (psi)'][t]
-            new_cold = cold * tgt / hot if hot else 0
-            corr_air = new_cold * air2K / air1K if air1K else 0
-            new_cold_b = new_cold / 14.504
-            corr_track = (((new_cold_b+1)*air2K)/((air2K*(new_cold_b+1)/(new_cold_b+1))+(track2K-track1K))-1)*14.504 if track1K else 0
-            self.results['Corrected Cold Pressure'][t].setText(f"{new_cold:.2f}")
-            self.results['Cold pr. corrected by air temp'][t].setText(f"{corr_air:.2f}")
-            self.results['Cold pr. corrected by Track Temp'][t].setText(f"{corr_track:.2f}")
+        vals = {ph: [self.spinboxes[ph][t].value() for t in tires] for ph in phases}
+        outputs = pressure_kernel.corrected_pressures(
+            vals['Target Pressures (psi)'], vals['Cold Pressures (psi)'], vals['Hot Pressures (psi)'],
+            self.air1.value(), self.air2.value(), self.track1.value(), self.track2.value())
+        # Guarda os resultados (2 casas, como exibidos) para o registro da sessão
+        self.calc_results = {}
+        for grp, values in zip(self.results, outputs):
+            self.calc_results[grp] = {}
+            for i, t in enumerate(tires):
+                value = round(float(values[i]), 2)
+                self.calc_results[grp][t] = value
+                self.results[grp][t].setText(f"{value:.2f}")
 
     def new_session(self):
         data = {
@@ -785,9 +861,12 @@ class TirePressureApp(QMainWindow):
         # Adiciona observações
         data['observacoes'] = self.obs_text.toPlainText()
         for grp, outs in self.results.items():
-            for tire, out in outs.items():
-                data[f"{grp}_{tire}"] = float(out.text() or 0)
+            for tire in outs:
+                data[f"{grp}_{tire}"] = self.calc_results.get(grp, {}).get(tire, 0.0)
         self.sessions_data.append(data)
+        if self.session_db:
+            setup_fields = [lbl.lower().replace(' ', '_') for lbl in self.arb_spins] + ['wing']
+            self.session_db.insert(dict(data, timestamp=datetime.now()), indexed=setup_fields)
         QMessageBox.information(self, "New Session", f"Session '{data['session_name']}' saved successfully.")
         self.reset_fields(); self.update_chart()
 
@@ -795,72 +874,68 @@ class TirePressureApp(QMainWindow):
         if not self.sessions_data:
             QMessageBox.warning(self, "No Data", "No sessions to export.")
             return
-        
-        # Reorganizar as colunas em uma ordem mais lógica
-        column_order = [
-            'session_name', 'start_time', 'end_time',
-            # Pressões alvo
-            'Target Pressures (psi)_FL', 'Target Pressures (psi)_FR',
-            'Target Pressures (psi)_RL', 'Target Pressures (psi)_RR',
-            # Pressões frias
-            'Cold Pressures (psi)_FL', 'Cold Pressures (psi)_FR',
-            'Cold Pressures (psi)_RL', 'Cold Pressures (psi)_RR',
-            # Pressões quentes
-            'Hot Pressures (psi)_FL', 'Hot Pressures (psi)_FR',
-            'Hot Pressures (psi)_RL', 'Hot Pressures (psi)_RR',
-            # Temperaturas
-            'air1', 'air2', 'track1', 'track2',
-            # Car Setup
-            'arb_fl', 'arb_fr', 'arb_rl', 'arb_rr', 'wing',
-            # Resultados calculados
-            'Corrected Cold Pressure_FL', 'Corrected Cold Pressure_FR',
-            'Corrected Cold Pressure_RL', 'Corrected Cold Pressure_RR',
-            'Cold pr. corrected by air temp_FL', 'Cold pr. corrected by air temp_FR',
-            'Cold pr. corrected by air temp_RL', 'Cold pr. corrected by air temp_RR',
-            'Cold pr. corrected by Track Temp_FL', 'Cold pr. corrected by Track Temp_FR',
-            'Cold pr. corrected by Track Temp_RL', 'Cold pr. corrected by Track Temp_RR',
-            # Observações
-            'observacoes'
-        ]
-        
-        df = pd.DataFrame(self.sessions_data)
-        
-        # Reordenar as colunas, mantendo apenas as que existem no DataFrame
-        existing_columns = [col for col in column_order if col in df.columns]
-        df = df[existing_columns]
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Save Report", "sessions_report.xlsx", "Excel Files (*.xlsx);;CSV Files (*.csv)")
-        if path:
-            try:
-                if path.endswith('.xlsx'):
-                    # Configurar o writer do Excel para formatar as células
-                    with pd.ExcelWriter(path, engine='openpyxl') as writer:
-                        df.to_excel(writer, index=False, sheet_name='Tire Data')
-                        # Ajustar largura das colunas
-                        worksheet = writer.sheets['Tire Data']
-                        for idx, col in enumerate(df.columns):
-                            # Encontrar o comprimento máximo na coluna
-                            max_length = max(
-                                df[col].astype(str).apply(len).max(),
-                                len(str(col))
-                            )
-                            # Adicionar um pouco de espaço extra
-                            worksheet.column_dimensions[get_column_letter(idx + 1)].width = max_length + 2
-                    QMessageBox.information(self, "Export Complete", f"Report saved to {path}")
-                else:
-                    # Salvar como CSV usando ponto e vírgula como separador
-                    df.to_csv(path, index=False, sep=';', decimal=',', encoding='utf-8-sig')
-                    QMessageBox.information(self, "Export Complete", f"Report saved to {path}")
-            except Exception as e:
-                # Tentar salvar como CSV se falhar o Excel
-                try:
-                    csv_path = path.rsplit('.', 1)[0] + '.csv'
-                    df.to_csv(csv_path, index=False, sep=';', decimal=',', encoding='utf-8-sig')
-                    QMessageBox.warning(self, "Fallback to CSV", 
-                        f"Could not save as Excel (error: {str(e)}). Saved as CSV: {csv_path}")
-                except Exception as e2:
-                    QMessageBox.critical(self, "Export Failed", 
-                        f"Failed to export data: {str(e2)}")
+        if self._export_worker is not None:
+            QMessageBox.information(self, "Export Running", "A report export is already in progress.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Save Report", "sessions_report.xlsx", "Excel Files (*.xlsx);;CSV Files (*.csv);;Feather Files (*.feather);;Parquet Files (*.parquet)")
+        if not path:
+            return
+
+        # A gravação roda no QThreadPool; a janela continua respondendo.
+        # Importado só aqui: o worker traz pandas (e openpyxl, no .xlsx)
+        from export_worker import ReportExportWorker
+        if self.session_db:
+            # Histórico completo lido do banco pelo worker, em páginas;
+            # a lista da janela (só as sessões recentes) não muda
+            worker = ReportExportWorker.from_database(self.session_db.path, REPORT_COLUMNS, path)
+        else:
+            # Reordenar as colunas, mantendo apenas as que existem nas sessões
+            present = {key for rec in self.sessions_data for key in rec}
+            existing_columns = [col for col in REPORT_COLUMNS if col in present]
+            worker = ReportExportWorker(self.sessions_data, existing_columns, path)
+        progress = QProgressDialog("Exporting report...", "Cancel", 0, len(self.sessions_data), self)
+        progress.setWindowTitle("Export")
+        progress.setMinimumDuration(300)
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        progress.canceled.connect(worker.cancel)
+        worker.signals.progress.connect(
+            lambda written, total: (progress.setMaximum(total), progress.setValue(written)))
+        worker.signals.finished.connect(self._export_finished)
+        worker.signals.failed.connect(self._export_failed)
+        worker.signals.cancelled.connect(self._export_cancelled)
+        self._export_worker = worker
+        self._export_progress = progress
+        QThreadPool.globalInstance().start(worker)
+
+    def _end_export(self):
+        self._export_progress.close()
+        self._export_progress.deleteLater()
+        self._export_progress = None
+        self._export_worker = None
+
+    def _notify(self, icon, title, text):
+        """Aviso sem bloquear a janela (não usa exec)."""
+        box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.setModal(False)
+        box.show()
+
+    def _export_finished(self, path, warning):
+        self._end_export()
+        if warning:
+            self._notify(QMessageBox.Warning, "Fallback to CSV", warning)
+        else:
+            self._notify(QMessageBox.Information, "Export Complete", f"Report saved to {path}")
+
+    def _export_failed(self, message):
+        self._end_export()
+        self._notify(QMessageBox.Critical, "Export Failed", message)
+
+    def _export_cancelled(self):
+        self._end_export()
+        self._notify(QMessageBox.Information, "Export Cancelled", "The report export was cancelled.")
 
     def reset_fields(self):
         from PySide6.QtCore import QTime
@@ -880,92 +955,38 @@ class TirePressureApp(QMainWindow):
             spin.setValue(1.0)  # Valor inicial para as barras
         self.wing_spin.setValue(0.0)
         # Limpar resultados
+        self.calc_results = {}
         for outs in self.results.values():
             for out in outs.values():
                 out.clear()
         # Limpar observações
         self.obs_text.clear()
 
+    @instrumentation.instrument()
     def update_chart(self):
-        self.ax.clear()
-        self.mini_ax.clear()
-        if not self.sessions_data:
-            self.ax.text(0.5,0.5,'No data', ha='center', va='center')
-            self.mini_ax.text(0.5,0.5,'No data', ha='center', va='center')
-        else:
-            df = pd.DataFrame(self.sessions_data)
-            x = range(len(df))
-            x_labels = df['session_name'].tolist()
-            
-            # Criar legenda separada abaixo do gráfico
-            box = self.ax.get_position()
-            self.ax.set_position([box.x0, box.y0 + box.height * 0.1,
-                                box.width, box.height * 0.9])
-            
-            box_mini = self.mini_ax.get_position()
-            self.mini_ax.set_position([box_mini.x0, box_mini.y0 + box_mini.height * 0.1,
-                                     box_mini.width, box_mini.height * 0.9])
-
-            lines = []
-            labels = []
-            
-            phases = ["Target Pressures (psi)", "Cold Pressures (psi)", "Hot Pressures (psi)"]
-            for ph in phases:
-                for t in ['FL','FR','RL','RR']:
-                    col = f"{ph}_{t}"
-                    if col in df:
-                        line, = self.ax.plot(x, df[col], label=col)
-                        self.mini_ax.plot(x, df[col], label=col)
-                        lines.append(line)
-                        labels.append(col)
-            
-            for attr in ['air1','air2','track1','track2']:
-                if attr in df:
-                    line, = self.ax.plot(x, df[attr], label=attr)
-                    self.mini_ax.plot(x, df[attr], label=attr)
-                    lines.append(line)
-                    labels.append(attr)
-            
-            # Configurar eixo x com os nomes das sessões
-            self.ax.set_xticks(x)
-            self.ax.set_xticklabels(x_labels, rotation=45, ha='right')
-            self.mini_ax.set_xticks(x)
-            self.mini_ax.set_xticklabels(x_labels, rotation=45, ha='right')
-            
-            self.ax.set_xlabel('Session Name')
-            self.ax.set_ylabel('Value')
-            self.mini_ax.set_xlabel('Session Name')
-            self.mini_ax.set_ylabel('Value')
-            
-            # Adicionar legenda abaixo do gráfico em múltiplas linhas
-            self.ax.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15),
-                         ncol=4, fontsize='small')
-            self.mini_ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.15),
-                              ncol=4, fontsize=6)
-            
-            # Adicionar grid
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            self.mini_ax.grid(True, linestyle='--', alpha=0.7)
-            
-            # Configurar interatividade
-            self.cursor = mplcursors.cursor(lines, hover=True)
-            @self.cursor.connect("add")
-            def on_add(sel):
-                x_val = int(sel.target[0])
-                y_val = sel.target[1]
-                session_name = x_labels[x_val]
-                sel.annotation.set_text(f'Session: {session_name}\nValue: {y_val:.2f}')
-                sel.annotation.get_bbox_patch().set(fc="black", alpha=0.8)
-                sel.annotation.set_color('white')
-            
-            # Ajustar layout
-            self.figure.tight_layout()
-            self.mini_figure.tight_layout()
-        
-        self.canvas.draw()
-        self.mini_canvas.draw()
+        # Só as sessões novas entram no modelo; as linhas existentes são reaproveitadas
+        self.chart_series.sync(self.sessions_data)
+        self.chart.refresh()
+        self.mini_chart.refresh()
+        if self._fullscreen_dialog is not None and self._fullscreen_dialog.isVisible():
+            self._fullscreen_chart.refresh()
 
     def show_mini_fullscreen_chart(self):
+        dialog = self._fullscreen_chart_dialog()
+        dialog.setWindowState(Qt.WindowMaximized)
+        dialog.exec()
+
+    @instrumentation.instrument("tire_pressure_app.TirePressureApp.show_mini_fullscreen_chart")
+    def _fullscreen_chart_dialog(self):
+        # O diálogo é montado uma vez e reaproveitado; só os dados novos são desenhados
+        if self._fullscreen_dialog is None:
+            self._fullscreen_dialog = self._build_fullscreen_chart_dialog()
+        self.chart_series.sync(self.sessions_data)
+        self._fullscreen_chart.refresh()
+        return self._fullscreen_dialog
+
+    @instrumentation.instrument()
+    def _build_fullscreen_chart_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Session Chart Fullscreen View")
         dialog.setWindowState(Qt.WindowMaximized)
@@ -980,11 +1001,10 @@ class TirePressureApp(QMainWindow):
         figure = Figure(figsize=(16, 9), dpi=100)
         canvas = FigureCanvas(figure)
         ax = figure.add_subplot(111)
-        
-        # Criar legenda separada abaixo do gráfico
-        box = ax.get_position()
-        ax.set_position([box.x0, box.y0 + box.height * 0.1,
-                        box.width, box.height * 0.9])
+        # Mesmas séries dos gráficos principal e mini, com linhas e fontes maiores
+        self._fullscreen_chart = IncrementalChart(
+            ax, self.chart_series, linewidth=2, legend_fontsize=10, label_fontsize=12,
+            empty_fontsize=14, layout_pad=2.0)
         
         # Usar a toolbar personalizada
         toolbar = CustomNavigationToolbar(canvas, dialog)
@@ -998,62 +1018,9 @@ class TirePressureApp(QMainWindow):
         
         layout.addLayout(toolbar_container)
         layout.addWidget(canvas)
-        
-        if self.sessions_data:
-            df = pd.DataFrame(self.sessions_data)
-            x = range(len(df))
-            x_labels = df['session_name'].tolist()
-            
-            lines = []
-            labels = []
-            
-            phases = ["Target Pressures (psi)", "Cold Pressures (psi)", "Hot Pressures (psi)"]
-            for ph in phases:
-                for t in ['FL','FR','RL','RR']:
-                    col = f"{ph}_{t}"
-                    if col in df:
-                        line, = ax.plot(x, df[col], label=col, linewidth=2)
-                        lines.append(line)
-                        labels.append(col)
-            
-            for attr in ['air1','air2','track1','track2']:
-                if attr in df:
-                    line, = ax.plot(x, df[attr], label=attr, linewidth=2)
-                    lines.append(line)
-                    labels.append(attr)
-            
-            # Configurar eixo x com os nomes das sessões
-            ax.set_xticks(x)
-            ax.set_xticklabels(x_labels, rotation=45, ha='right')
-            
-            ax.set_xlabel('Session Name', fontsize=12)
-            ax.set_ylabel('Value', fontsize=12)
-            
-            # Adicionar legenda abaixo do gráfico em múltiplas linhas
-            ax.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15),
-                     ncol=4, fontsize=10)
-            
-            ax.grid(True, linestyle='--', alpha=0.7)
-            
-            # Configurar interatividade
-            cursor = mplcursors.cursor(lines, hover=True)
-            @cursor.connect("add")
-            def on_add(sel):
-                x_val = int(sel.target[0])
-                y_val = sel.target[1]
-                session_name = x_labels[x_val]
-                sel.annotation.set_text(f'Session: {session_name}\nValue: {y_val:.2f}')
-                sel.annotation.get_bbox_patch().set(fc="black", alpha=0.8)
-                sel.annotation.set_color('white')
-            
-            # Ajustar layout
-            figure.tight_layout(pad=2.0)
-        else:
-            ax.text(0.5, 0.5, 'No data', ha='center', va='center', fontsize=14)
-        
-        canvas.draw()
-        dialog.exec()
+        return dialog
 
+    @instrumentation.instrument()
     def build_rigidez_tab(self, parent):
         # Criar um widget de conteúdo e layout principal
         content_widget = QWidget()
@@ -1085,24 +1052,34 @@ class TirePressureApp(QMainWindow):
         input_layout.setSpacing(8)
         input_layout.setContentsMargins(10,10,10,10)
 
+        # Carro / kit de barras (tabelas do registro arb_tables)
+        self.arb_table = arb_tables.registry.get()
+        input_layout.addWidget(QLabel("CAR / ARB KIT"), 0, 0)
+        self.arb_table_combo = QComboBox()
+        self.arb_table_combo.addItems(arb_tables.registry.names())
+        self.arb_table_combo.setCurrentText(self.arb_table.name)
+        self.arb_table_combo.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
+        input_layout.addWidget(self.arb_table_combo, 0, 1, 1, 3)
+
         # Dianteira
-        input_layout.addWidget(QLabel("ARB (FL)"), 0, 0)
+        input_layout.addWidget(QLabel("ARB (FL)"), 1, 0)
         self.rig_fl = QDoubleSpinBox(); self.rig_fl.setRange(1.0, 7.0); self.rig_fl.setSingleStep(0.5); self.rig_fl.setValue(2.0)
         self.rig_fl.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
-        input_layout.addWidget(self.rig_fl, 0, 1)
-        input_layout.addWidget(QLabel("ARB (FR)"), 0, 2)
+        input_layout.addWidget(self.rig_fl, 1, 1)
+        input_layout.addWidget(QLabel("ARB (FR)"), 1, 2)
         self.rig_fr = QDoubleSpinBox(); self.rig_fr.setRange(1.0, 7.0); self.rig_fr.setSingleStep(0.5); self.rig_fr.setValue(2.0)
         self.rig_fr.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
-        input_layout.addWidget(self.rig_fr, 0, 3)
+        input_layout.addWidget(self.rig_fr, 1, 3)
         # Traseira
-        input_layout.addWidget(QLabel("ARB (RL)"), 1, 0)
+        input_layout.addWidget(QLabel("ARB (RL)"), 2, 0)
         self.rig_rl = QDoubleSpinBox(); self.rig_rl.setRange(1.0, 7.0); self.rig_rl.setSingleStep(0.5); self.rig_rl.setValue(6.0)
         self.rig_rl.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
-        input_layout.addWidget(self.rig_rl, 1, 1)
-        input_layout.addWidget(QLabel("ARB (RR)"), 1, 2)
+        input_layout.addWidget(self.rig_rl, 2, 1)
+        input_layout.addWidget(QLabel("ARB (RR)"), 2, 2)
         self.rig_rr = QDoubleSpinBox(); self.rig_rr.setRange(1.0, 7.0); self.rig_rr.setSingleStep(0.5); self.rig_rr.setValue(6.0)
         self.rig_rr.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
-        input_layout.addWidget(self.rig_rr, 1, 3)
+        input_layout.addWidget(self.rig_rr, 2, 3)
+        self._apply_arb_ranges()
 
         # Botão calcular
         btn_calc = QPushButton("CALCULATE STIFFNESS DISTRIBUTION")
@@ -1121,7 +1098,7 @@ class TirePressureApp(QMainWindow):
                 border: 1px solid #fff;
             }
         """)
-        input_layout.addWidget(btn_calc, 2, 0, 1, 4)
+        input_layout.addWidget(btn_calc, 3, 0, 1, 4)
         btn_calc.clicked.connect(self.calcular_rigidez_backend)
 
         # Resultados destacados
@@ -1137,7 +1114,7 @@ class TirePressureApp(QMainWindow):
                 margin-top: 10px;
             }
         """)
-        input_layout.addWidget(self.result_highlight, 3, 0, 1, 4)
+        input_layout.addWidget(self.result_highlight, 4, 0, 1, 4)
 
         layout.addWidget(input_box)
 
@@ -1190,6 +1167,20 @@ class TirePressureApp(QMainWindow):
         """)
         search_layout.addWidget(btn_search, 1, 0, 1, 4)
         btn_search.clicked.connect(self.buscar_combinacoes_backend)
+
+        # Busca conjunta ARB × asa (fronteira de Pareto entre os dois balanços)
+        search_layout.addWidget(QLabel("AERO BALANCE TARGET (%)"), 2, 0)
+        self.aero_target = QDoubleSpinBox(); self.aero_target.setRange(-20.0, 20.0); self.aero_target.setValue(0.0); self.aero_target.setSingleStep(0.1)
+        self.aero_target.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
+        search_layout.addWidget(self.aero_target, 2, 1)
+        search_layout.addWidget(QLabel("CURRENT WING"), 2, 2)
+        self.current_wing = QComboBox()
+        self.current_wing.setStyleSheet("font-size: 13px; min-width: 60px; min-height: 24px;")
+        search_layout.addWidget(self.current_wing, 2, 3)
+        btn_joint = QPushButton("FIND ARB + WING SETUPS")
+        btn_joint.setStyleSheet(btn_search.styleSheet())
+        search_layout.addWidget(btn_joint, 3, 0, 1, 4)
+        btn_joint.clicked.connect(self.buscar_setups_balanceados)
         layout.addWidget(search_box)
 
         # Tabela de resultados
@@ -1220,10 +1211,13 @@ class TirePressureApp(QMainWindow):
         self.table.verticalHeader().setVisible(True)
         self.table.setMinimumHeight(6 * 28 + 32)  # 6 linhas + header
         self.table.setMaximumHeight(12 * 28 + 32) # até 12 linhas sem rolagem
+        self.setup_cursor = None
+        self.table.verticalScrollBar().valueChanged.connect(self._carregar_mais_setups)
         layout.addWidget(self.table)
 
         # Adiciona o heatmap e imagens ao final da aba
         self.add_heatmap_and_images(layout)
+        self.arb_table_combo.currentTextChanged.connect(self.trocar_tabela_arb)
 
         # Adiciona o layout de conteúdo ao scroll area
         scroll = QScrollArea(parent)
@@ -1233,12 +1227,37 @@ class TirePressureApp(QMainWindow):
         parent_layout.setContentsMargins(0,0,0,0)
         parent_layout.addWidget(scroll)
 
+    def _apply_arb_ranges(self):
+        """Ajusta faixa e passo das posições de ARB à tabela escolhida."""
+        for axle, spins in (('front', (self.rig_fl, self.rig_fr)), ('rear', (self.rig_rl, self.rig_rr))):
+            pos = self.arb_table.positions(axle)
+            step = float(min(b - a for a, b in zip(pos, pos[1:])))
+            for spin in spins:
+                spin.setRange(float(pos[0]), float(pos[-1]))
+                spin.setSingleStep(step)
+
+    def trocar_tabela_arb(self, name):
+        try:
+            self.arb_table = arb_tables.registry.get(name)
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "ARB Table", f"Could not load ARB table '{name}':\n{e}")
+            self.arb_table_combo.blockSignals(True)
+            self.arb_table_combo.setCurrentText(self.arb_table.name)
+            self.arb_table_combo.blockSignals(False)
+            return
+        self._apply_arb_ranges()
+        self.setup_cursor = None
+        self.table.setRowCount(0)
+        self.result_highlight.clear()
+        self.fill_heatmap()
+        self.fill_wing_table()
+
     def calcular_rigidez_backend(self):
         try:
             front = [self.rig_fl.value(), self.rig_fr.value()]
             rear = [self.rig_rl.value(), self.rig_rr.value()]
-            rig_f, rig_r = rigidez_backend.get_rigidez(front, rear)
-            dist = rigidez_backend.get_distribution(front, rear)
+            rig_f, rig_r = rigidez_backend.get_rigidez(front, rear, table=self.arb_table)
+            dist = rigidez_backend.get_distribution(front, rear, table=self.arb_table)
             self.result_highlight.setText(f"<span style='font-size:22px;'>STIFFNESS AT FRONT ARB: <b>{rig_f:.2f}</b> N/mm &nbsp;&nbsp;|&nbsp;&nbsp; STIFFNESS AT REAR ARB: <b>{rig_r:.2f}</b> N/mm<br>ARBs STIFFNESS DISTRIBUTION: <b>{dist:.2f}%</b></span>")
         except Exception as e:
             self.result_highlight.setText(f"<span style='color:#fff;font-size:20px;'>Erro: {str(e)}</span>")
@@ -1246,9 +1265,19 @@ class TirePressureApp(QMainWindow):
     def buscar_combinacoes_backend(self):
         target = self.target_pct.value()
         tol = self.tol_pct.value()
-        resultados = rigidez_backend.find_setups(target, tol)
-        self.table.setRowCount(len(resultados))
-        for i, (pf, pr, pct) in enumerate(resultados):
+        # Resultados paginados: só a primeira página vira itens da tabela; as
+        # demais são buscadas em _carregar_mais_setups ao rolar até o fim
+        self.setup_cursor = rigidez_backend.SetupCursor(target, tol, table=self.arb_table,
+                                                        page_size=SETUP_PAGE_SIZE)
+        self.table.setColumnCount(3)
+        self.table.setHorizontalHeaderLabels(["ARB FRONT", "ARB REAR", "DIST %"])
+        self.table.setRowCount(0)
+        self._append_setups(self.setup_cursor.fetch())
+
+    def _append_setups(self, resultados):
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(resultados))
+        for i, (pf, pr, pct) in enumerate(resultados, start):
             item_pf = QTableWidgetItem(f"{pf:.1f}")
             item_pr = QTableWidgetItem(f"{pr:.1f}")
             item_pct = QTableWidgetItem(f"{pct:.2f}%")
@@ -1258,15 +1287,109 @@ class TirePressureApp(QMainWindow):
             self.table.setItem(i, 1, item_pr)
             self.table.setItem(i, 2, item_pct)
 
+    def _carregar_mais_setups(self, value):
+        cursor = self.setup_cursor
+        bar = self.table.verticalScrollBar()
+        if cursor is not None and cursor.has_more and value >= bar.maximum() - 2:
+            self._append_setups(cursor.fetch())
+
+    def fill_heatmap(self):
+        """Preenche o heatmap de distribuição: linhas = traseira, colunas = dianteira."""
+        table = self.heatmap_table
+        m = rigidez_backend.distribution_matrix(self.arb_table)
+        dianteiras, traseiras = m.front.tolist(), m.rear.tolist()
+        table.clear()
+        table.setRowCount(len(traseiras))
+        table.setColumnCount(len(dianteiras))
+        table.setHorizontalHeaderLabels([str(p) for p in dianteiras])
+        table.setVerticalHeaderLabels([str(p) for p in traseiras])
+        table.setMinimumHeight(32 + len(traseiras) * 28)
+        table.setMaximumHeight(32 + len(traseiras) * 28)
+
+        # Cores pré-calculadas de uma vez: vermelho (baixo) a azul (alto)
+        values = m.pct.T  # linhas = traseira, colunas = dianteira
+        vmin, vmax = values.min(), values.max()
+        ratio = (values - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(values)
+        reds = (255 * (1 - ratio)).astype(int).tolist()
+        greens = (255 * (1 - np.abs(0.5 - ratio) * 2)).astype(int).tolist()
+        blues = (255 * ratio).astype(int).tolist()
+        # Sobreposição: "distribuição (Δ por clique)"; '–' se o clique sai da tabela
+        overlay = self.heatmap_overlay.currentData()
+        deltas = None
+        if overlay is not None:
+            deltas = rigidez_backend.sensitivity(self.arb_table).get(*overlay).T.tolist()
+        for i, row in enumerate(values.tolist()):
+            for j, pct in enumerate(row):
+                texto = f'{pct:.2f}'
+                if deltas is not None:
+                    d = deltas[i][j]
+                    texto += f' ({d:+.2f})' if d == d else ' (–)'
+                item = QTableWidgetItem(texto)
+                item.setTextAlignment(Qt.AlignCenter)
+                item.setBackground(QColor(reds[i][j], greens[i][j], blues[i][j]))
+                table.setItem(i, j, item)
+
+    def fill_wing_table(self):
+        """Preenche o mapa da asa com os dados da tabela de ARB escolhida."""
+        wing_table = self.wing_table
+        wing_data = rigidez_backend.wing_table(self.arb_table)
+        wing_table.setRowCount(len(wing_data))
+        balances = [balance for _, balance in wing_data]
+        lo, hi = (min(balances), max(balances)) if balances else (0.0, 0.0)
+        for i, (pos, balance_value) in enumerate(wing_data):
+            item_pos = QTableWidgetItem(pos)
+            item_balance = QTableWidgetItem(f"{balance_value:.1f}%".replace('.', ','))
+            for item in [item_pos, item_balance]:
+                item.setTextAlignment(Qt.AlignCenter)
+            # Colorir baseado no valor do balance
+            ratio = (balance_value - lo) / (hi - lo) if hi > lo else 0  # Normalizar entre 0 e 1
+            r = int(255 * (1 - ratio))
+            g = int(255 * (1 - abs(0.5 - ratio) * 2))
+            b = int(255 * ratio)
+            item_balance.setBackground(QColor(r, g, b))
+            wing_table.setItem(i, 0, item_pos)
+            wing_table.setItem(i, 1, item_balance)
+
+        wing_table.setMinimumHeight(32 + len(wing_data) * 28)
+        wing_table.setMaximumHeight(32 + len(wing_data) * 28)
+        self.current_wing.clear()
+        self.current_wing.addItems([pos for pos, _ in wing_data])
+        if 'P6' in [pos for pos, _ in wing_data]:
+            self.current_wing.setCurrentText('P6')
+
+    def buscar_setups_balanceados(self):
+        # Setup atual como baseline, se as médias das barras estiverem na tabela
+        front = (self.rig_fl.value() + self.rig_fr.value()) / 2
+        rear = (self.rig_rl.value() + self.rig_rr.value()) / 2
+        m = rigidez_backend.distribution_matrix(self.arb_table)
+        wing = self.current_wing.currentText()
+        baseline = None
+        if front in m.front_index and rear in m.rear_index and wing:
+            baseline = (front, rear, wing)
+        try:
+            resultados = rigidez_backend.find_balanced_setups(
+                self.target_pct.value(), self.aero_target.value(), baseline=baseline, table=self.arb_table)
+        except ValueError as e:
+            QMessageBox.warning(self, "ARB + Wing", str(e))
+            return
+        self.setup_cursor = None
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["ARB FRONT", "ARB REAR", "WING", "DIST %", "AERO %", "CLICKS"])
+        self.table.setRowCount(len(resultados))
+        for i, r in enumerate(resultados):
+            textos = [f"{r.front:.1f}", f"{r.rear:.1f}", r.wing, f"{r.mech_pct:.2f}%",
+                      f"{r.aero_pct:.1f}%", str(r.clicks) if baseline else "-"]
+            for j, texto in enumerate(textos):
+                item = QTableWidgetItem(texto)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(i, j, item)
+
     def add_heatmap_and_images(self, parent_layout):
         from PySide6.QtGui import QColor, QPixmap
         from PySide6.QtWidgets import QTableWidgetItem, QLabel, QHBoxLayout, QWidget, QVBoxLayout
         import os
-        # Heatmap
-        posicoes = [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0]
-        table = QTableWidget(len(posicoes), len(posicoes))
-        table.setHorizontalHeaderLabels([str(p) for p in posicoes])
-        table.setVerticalHeaderLabels([str(p) for p in posicoes])
+        # Heatmap (posições da tabela de ARB escolhida; preenchido em fill_heatmap)
+        table = QTableWidget()
         table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
@@ -1289,36 +1412,19 @@ class TirePressureApp(QMainWindow):
             }
         """)
         table.verticalHeader().setVisible(True)
-        table.setMinimumHeight(32 + len(posicoes) * 28)
-        table.setMaximumHeight(32 + len(posicoes) * 28)
-
-        # Calcular todos os valores e encontrar min/max para normalizar as cores
-        values = []
-        for i, traseira in enumerate(posicoes):
-            for j, dianteira in enumerate(posicoes):
-                try:
-                    pct = rigidez_backend.get_distribution([dianteira, dianteira], [traseira, traseira])
-                except Exception:
-                    pct = None
-                values.append(pct if pct is not None else 0)
-        vmin, vmax = min(values), max(values)
-        # Preencher a tabela
-        for i, traseira in enumerate(posicoes):
-            for j, dianteira in enumerate(posicoes):
-                try:
-                    pct = rigidez_backend.get_distribution([dianteira, dianteira], [traseira, traseira])
-                except Exception:
-                    pct = None
-                item = QTableWidgetItem(f'{pct:.2f}' if pct is not None else '')
-                item.setTextAlignment(Qt.AlignCenter)
-                # Colorir: vermelho (baixo) a azul (alto)
-                if pct is not None:
-                    ratio = (pct - vmin) / (vmax - vmin) if vmax > vmin else 0
-                    r = int(255 * (1 - ratio))
-                    g = int(255 * (1 - abs(0.5 - ratio) * 2))
-                    b = int(255 * ratio)
-                    item.setBackground(QColor(r, g, b))
-                table.setItem(i, j, item)
+        self.heatmap_table = table
+
+        # Sobreposição opcional: variação da distribuição por clique em cada setup
+        self.heatmap_overlay = QComboBox()
+        self.heatmap_overlay.setStyleSheet("font-size: 12px; min-height: 22px;")
+        for label, data in [("NONE", None),
+                            ("FRONT ARB +1 CLICK", ('front', 1)), ("FRONT ARB -1 CLICK", ('front', -1)),
+                            ("REAR ARB +1 CLICK", ('rear', 1)), ("REAR ARB -1 CLICK", ('rear', -1)),
+                            ("ONE FRONT BAR +1 CLICK", ('fl', 1)), ("ONE FRONT BAR -1 CLICK", ('fl', -1)),
+                            ("ONE REAR BAR +1 CLICK", ('rl', 1)), ("ONE REAR BAR -1 CLICK", ('rl', -1))]:
+            self.heatmap_overlay.addItem(label, data)
+        self.heatmap_overlay.currentIndexChanged.connect(lambda _: self.fill_heatmap())
+        self.fill_heatmap()
 
         # Imagens
         images_widget = QWidget()
@@ -1358,7 +1464,12 @@ class TirePressureApp(QMainWindow):
         heatmap_layout = QVBoxLayout(heatmap_container)
         heatmap_layout.setContentsMargins(0,0,0,0)
         heatmap_layout.setSpacing(0)
-        heatmap_layout.addWidget(QLabel("DISTRIBUTION MAP (%)"))
+        heatmap_header = QHBoxLayout()
+        heatmap_header.addWidget(QLabel("DISTRIBUTION MAP (%)"))
+        heatmap_header.addStretch()
+        heatmap_header.addWidget(QLabel("SENSITIVITY OVERLAY (Δ% PER CLICK)"))
+        heatmap_header.addWidget(self.heatmap_overlay)
+        heatmap_layout.addLayout(heatmap_header)
         heatmap_layout.addWidget(table)
 
         # Adicionar tabela de posições da asa
@@ -1386,40 +1497,8 @@ class TirePressureApp(QMainWindow):
             }
         """)
         wing_table.verticalHeader().setVisible(False)
-        
-        # Dados da tabela
-        wing_data = [
-            ("P14", "-6,0%"),
-            ("P13", "-5,3%"),
-            ("P12", "-4,6%"),
-            ("P11", "-3,9%"),
-            ("P10", "-3,2%"),
-            ("P9", "-2,4%"),
-            ("P8", "-1,6%"),
-            ("P7", "-0,8%"),
-            ("P6", "0,0%"),
-            ("P5", "1,1%"),
-            ("P4", "2,3%")
-        ]
-        
-        wing_table.setRowCount(len(wing_data))
-        for i, (pos, balance) in enumerate(wing_data):
-            item_pos = QTableWidgetItem(pos)
-            item_balance = QTableWidgetItem(balance)
-            for item in [item_pos, item_balance]:
-                item.setTextAlignment(Qt.AlignCenter)
-            # Colorir baseado no valor do balance
-            balance_value = float(balance.replace('%', '').replace(',', '.'))
-            ratio = (balance_value + 6) / 8.3  # Normalizar entre 0 e 1
-            r = int(255 * (1 - ratio))
-            g = int(255 * (1 - abs(0.5 - ratio) * 2))
-            b = int(255 * ratio)
-            item_balance.setBackground(QColor(r, g, b))
-            wing_table.setItem(i, 0, item_pos)
-            wing_table.setItem(i, 1, item_balance)
-        
-        wing_table.setMinimumHeight(32 + len(wing_data) * 28)
-        wing_table.setMaximumHeight(32 + len(wing_data) * 28)
+        self.wing_table = wing_table
+        self.fill_wing_table()
 
         # Container para a tabela da asa
         wing_container = QWidget()
@@ -1436,6 +1515,10 @@ class TirePressureApp(QMainWindow):
 
 if __name__=='__main__':
     app = QApplication(sys.argv)
+    if instrumentation.is_enabled():
+        # TPA_PROFILE=1: grava as latências medidas ao fechar o app
+        profile_out = os.environ.get('TPA_PROFILE_OUT', 'tpa_profile.json')
+        app.aboutToQuit.connect(lambda: instrumentation.export(profile_out))
     win = TirePressureApp()
     win.show()
     sys.exit(app.exec())